@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def private_cache():
+    """Тесты не читают и не пишут кэш рабочей копии."""
+    from core.cache import private_cache
+    with private_cache():
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(private_cache):
+    # База откатывается после каждого теста, а кэш нет.
+    from django.core.cache import cache
+    cache.clear()
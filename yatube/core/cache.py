@@ -0,0 +1,48 @@
+import itertools
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import override_settings
+
+# Раз во сколько записей процесс проверяет переполнение каталога.
+DEFAULT_CULL_EVERY = 100
+
+
+class SparseCullFileBasedCache(FileBasedCache):
+    """Файловый кэш, который считает файлы не при каждой записи.
+
+    Стандартный листает весь каталог на каждом set(): с десятками тысяч
+    записей это дороже самой записи. Здесь проверка MAX_ENTRIES идёт
+    раз в OPTIONS['CULL_EVERY'] записей, и каталог может ненадолго
+    превысить предел на столько же файлов с каждого процесса.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        options = params.get('OPTIONS', {})
+        self._cull_every = int(options.get('CULL_EVERY', DEFAULT_CULL_EVERY))
+        self._writes = itertools.count()
+
+    def _cull(self):
+        if next(self._writes) % self._cull_every == 0:
+            super()._cull()
+
+
+@contextmanager
+def private_cache():
+    """Подменяет кэш по умолчанию пустым файловым во временном каталоге.
+
+    Для тестов и замеров на временной базе: их карточки и страницы не
+    должны ни стирать общий кэш сервера, ни попадать в него.
+    """
+    location = tempfile.mkdtemp(prefix='yatube-cache-')
+    try:
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'core.cache.SparseCullFileBasedCache',
+            'LOCATION': location,
+        }}):
+            yield location
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
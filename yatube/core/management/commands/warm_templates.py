@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.template.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = ('Компилирует все шаблоны из templates/ и выводит время '
+            'компиляции каждого.')
+
+    def handle(self, *args, **options):
+        timings, total = warm_templates()
+        failed = [name for name, duration in timings if duration is None]
+        for name, duration in sorted(
+                timings, key=lambda item: -(item[1] or 0)):
+            if duration is not None:
+                self.stdout.write(f'{duration * 1000:>9.2f} мс  {name}')
+        self.stdout.write(
+            f'Шаблонов: {len(timings)}, всего {total * 1000:.1f} мс.')
+        if failed:
+            raise CommandError(
+                'Не компилируются: ' + ', '.join(failed))
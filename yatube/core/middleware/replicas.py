@@ -0,0 +1,45 @@
+from django.conf import settings
+
+from core.routers import replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_COOKIE = 'db_primary'
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтение безопасных запросов на реплики.
+
+    После небезопасного запроса клиент получает куку, и ещё
+    DATABASE_STICKY_SECONDS его запросы читают с основной базы: автор
+    сразу видит свои правки, пока реплики догоняют. Кука, а не ключ
+    в сессии, — чтобы не читать и не переписывать сессию ради этого.
+    Подделка куки лишь переводит клиента на основную базу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                response.set_cookie(
+                    PRIMARY_COOKIE, '1',
+                    max_age=settings.DATABASE_STICKY_SECONDS,
+                    httponly=True, samesite='Lax',
+                )
+            return response
+        if PRIMARY_COOKIE in request.COOKIES:
+            return self.get_response(request)
+        with replica_reads():
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.stream_from_replicas(
+                response.streaming_content)
+        return response
+
+    @staticmethod
+    def stream_from_replicas(content):
+        # Потоковый ответ читает базу уже после выхода из middleware.
+        with replica_reads():
+            yield from content
@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+logger = logging.getLogger('yatube.timing')
+
+_local = threading.local()
+
+
+class RequestTimings:
+    """Накопленные за запрос длительности, в секундах."""
+
+    def __init__(self):
+        self.sql = 0.0
+        self.sql_count = 0
+        self.template = 0.0
+        self.template_depth = 0
+        self.view = 0.0
+        self.view_started = None
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - started
+            self.sql_count += 1
+
+
+def current_timings():
+    return getattr(_local, 'timings', None)
+
+
+@contextmanager
+def template_timer():
+    """Засекает отрисовку шаблона; вложенные шаблоны не считаются дважды."""
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    timings.template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.template_depth -= 1
+        if not timings.template_depth:
+            timings.template += time.perf_counter() - started
+
+
+class ServerTimingMiddleware:
+    """Отдаёт время SQL, шаблонов, вьюхи и запроса в Server-Timing.
+
+    Те же данные пишутся строкой в лог yatube.timing с именем вьюхи.
+    Подсчёт SQL идёт через execute_wrapper и не требует DEBUG=True.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = _local.timings = RequestTimings()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(
+                        timings.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            _local.timings = None
+        total = time.perf_counter() - started
+        if timings.view_started is not None:
+            timings.view = time.perf_counter() - timings.view_started
+        response['Server-Timing'] = ', '.join((
+            f'sql;dur={timings.sql * 1000:.1f};'
+            f'desc="{timings.sql_count} queries"',
+            f'tpl;dur={timings.template * 1000:.1f}',
+            f'view;dur={timings.view * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        self.log(request, response, timings, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = current_timings()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def log(self, request, response, timings, total):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        match = request.resolver_match
+        fields = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'status': response.status_code,
+            'sql_count': timings.sql_count,
+            'sql_ms': round(timings.sql * 1000, 1),
+            'tpl_ms': round(timings.template * 1000, 1),
+            'view_ms': round(timings.view * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+        }
+        logger.info(
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'timing': fields},
+        )
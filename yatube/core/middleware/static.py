@@ -0,0 +1,86 @@
+import json
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+MANIFEST_NAME = 'staticfiles.json'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+GZIP_ACCEPTED_RE = re.compile(r'\bgzip\b(?!\s*;\s*q=0(\.0*)?\s*(,|$))')
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную collectstatic статику из STATIC_ROOT.
+
+    Файлы с хэшем в имени (значения манифеста) кэшируются клиентом
+    навсегда, остальные — на STATIC_MAX_AGE секунд. Если клиент
+    принимает gzip и рядом лежит name.gz, отдаётся сжатая копия.
+    Запросы к файлам, которых нет в STATIC_ROOT, идут дальше по цепочке.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+        self.hashed_names = self.load_hashed_names()
+
+    def load_hashed_names(self):
+        if not self.root:
+            return frozenset()
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as manifest:
+                return frozenset(json.load(manifest)['paths'].values())
+        except (OSError, ValueError, KeyError):
+            return frozenset()
+
+    def __call__(self, request):
+        if (self.root and request.method in ('GET', 'HEAD')
+                and request.path_info.startswith(self.prefix)):
+            response = self.serve(
+                request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        content_type, _ = mimetypes.guess_type(path)
+        has_gzip = os.path.isfile(f'{path}.gz')
+        use_gzip = has_gzip and GZIP_ACCEPTED_RE.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if use_gzip:
+            path = f'{path}.gz'
+        stat = os.stat(path)
+        etag = quote_etag('{:x}-{:x}{}'.format(
+            int(stat.st_mtime), stat.st_size, '-gz' if use_gzip else ''))
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = FileResponse(
+                open(path, 'rb'),
+                content_type=content_type or 'application/octet-stream',
+            )
+            response['Content-Length'] = stat.st_size
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+        if has_gzip:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if name in self.hashed_names:
+            response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}')
+        return response
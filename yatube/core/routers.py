@@ -0,0 +1,69 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_local = threading.local()
+
+
+def replica_reads_enabled():
+    return getattr(_local, 'replica_reads', False)
+
+
+@contextmanager
+def replica_reads():
+    """Разрешает чтение с реплик внутри блока.
+
+    Вне блока — в командах, сигналах и небезопасных запросах — всё
+    читается с основной базы.
+    """
+    previous = replica_reads_enabled()
+    _local.replica_reads = True
+    try:
+        yield
+    finally:
+        _local.replica_reads = previous
+
+
+def replica_cache_timeout(timeout):
+    """Время жизни кэша для данных, прочитанных в текущем потоке.
+
+    Реплика может отставать от записи, которая уже сдвинула поколения
+    кэша, и собранное по ней легло бы под новые ключи. Такие записи
+    живут не дольше DATABASE_STICKY_SECONDS — предела отставания.
+    """
+    if not settings.REPLICA_DATABASES or not replica_reads_enabled():
+        return timeout
+    if timeout is None:
+        return settings.DATABASE_STICKY_SECONDS
+    return min(timeout, settings.DATABASE_STICKY_SECONDS)
+
+
+class PrimaryReplicaRouter:
+    """Пишет в основную базу, читает с реплик из REPLICA_DATABASES.
+
+    Реплики используются только внутри replica_reads(). Сессии всегда
+    читаются с основной базы: только что созданная сессия могла ещё
+    не доехать до реплики.
+    """
+
+    primary_apps = frozenset({'sessions'})
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.REPLICA_DATABASES
+        if (not replicas or not replica_reads_enabled()
+                or model._meta.app_label in self.primary_apps):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии основной базы, связи между ними допустимы.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
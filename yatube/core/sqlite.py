@@ -0,0 +1,64 @@
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import (DEFAULT_DB_ALIAS, OperationalError, connections,
+                       transaction)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Выставляет SQLITE_PRAGMAS каждому новому соединению с SQLite.
+
+    Подключается к сигналу connection_created в CoreConfig.ready.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    apply_pragmas(connection.connection, settings.SQLITE_PRAGMAS)
+
+
+def apply_pragmas(db, pragmas):
+    # Запросы идут мимо курсора Django и не попадают в счётчики SQL.
+    for name, value in pragmas.items():
+        db.execute(f'PRAGMA {name} = {value}')
+
+
+def is_lock_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def call_with_lock_retries(func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Выполняет func в транзакции, повторяя её при блокировке базы.
+
+    busy_timeout не спасает транзакцию, которая начала с чтения и не
+    может перейти к записи, пока пишет другое соединение: SQLite сразу
+    отвечает «database is locked». Такую транзакцию надо начать заново.
+    Повторы идут с экспоненциальной паузой и случайным разбросом, их
+    число — SQLITE_LOCK_RETRIES. Внутри чужой транзакции повтор
+    бесполезен, поэтому там func вызывается один раз.
+    """
+    if connections[using].in_atomic_block:
+        with transaction.atomic(using=using):
+            return func(*args, **kwargs)
+    retries = settings.SQLITE_LOCK_RETRIES
+    for attempt in range(retries + 1):
+        try:
+            with transaction.atomic(using=using):
+                return func(*args, **kwargs)
+        except OperationalError as error:
+            if attempt == retries or not is_lock_error(error):
+                raise
+        time.sleep(settings.SQLITE_LOCK_RETRY_DELAY * 2 ** attempt
+                   * random.uniform(0.5, 1.5))
+
+
+def retry_on_lock(view):
+    """Повторяет пишущий запрос к вьюхе, если база была заблокирована."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        return call_with_lock_retries(view, request, *args, **kwargs)
+    return wrapper
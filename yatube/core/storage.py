@@ -0,0 +1,58 @@
+import gzip
+import mimetypes
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+# Уже сжатые форматы (png, jpg, woff2) gzip только раздувает.
+COMPRESSIBLE_TYPES = (
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+    'image/vnd.microsoft.icon',
+    'image/x-icon',
+)
+# Сжатая копия сохраняется, только если она меньше хотя бы на 5%.
+MIN_GZIP_RATIO = 0.95
+
+
+def is_compressible(name):
+    content_type, encoding = mimetypes.guess_type(name)
+    if encoding or content_type is None:
+        return False
+    return (content_type.startswith('text/')
+            or content_type in COMPRESSIBLE_TYPES)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами в именах плюс gzip-копии рядом с файлами.
+
+    collectstatic пишет для сжимаемых файлов name.gz, который
+    StaticFilesMiddleware отдаёт клиентам с Accept-Encoding: gzip.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                processed_names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(processed_names):
+            if is_compressible(name):
+                self.compress(name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as original:
+            data = original.read()
+        gz_path = f'{path}.gz'
+        # mtime=0 делает архив воспроизводимым между сборками.
+        with open(gz_path, 'wb') as target:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=target,
+                               compresslevel=9, mtime=0) as compressed:
+                compressed.write(data)
+        if os.path.getsize(gz_path) > len(data) * MIN_GZIP_RATIO:
+            os.remove(gz_path)
@@ -0,0 +1,21 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from core.middleware.server_timing import template_timer
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with template_timer():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Шаблонный бэкенд Django, сообщающий время отрисовки в Server-Timing."""
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return TimedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
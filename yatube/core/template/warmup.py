@@ -0,0 +1,46 @@
+import logging
+import os
+import time
+
+from django.template import engines
+
+logger = logging.getLogger('yatube.templates')
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def template_names(directory):
+    """Имена всех шаблонов каталога относительно него самого."""
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.endswith(TEMPLATE_SUFFIXES):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Компилирует шаблоны из DIRS всех движков.
+
+    С кэширующим загрузчиком скомпилированные шаблоны остаются в памяти
+    процесса, и первый запрос не тратит время на разбор. Возвращает
+    список (имя, секунды) и общее время; ошибки разбора не прерывают
+    прогрев, а пишутся в лог и попадают в список с временем None.
+    """
+    started = time.perf_counter()
+    timings = []
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for name in template_names(directory):
+                template_started = time.perf_counter()
+                try:
+                    engine.get_template(name)
+                except Exception:
+                    logger.exception('Шаблон %s не скомпилирован', name)
+                    timings.append((name, None))
+                    continue
+                timings.append(
+                    (name, time.perf_counter() - template_started))
+    total = time.perf_counter() - started
+    logger.info('Прогрето шаблонов: %d за %.1f мс',
+                len(timings), total * 1000)
+    return timings, total
@@ -0,0 +1,79 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from core.cache import private_cache
+
+
+class PrivateCacheRunner(DiscoverRunner):
+    """Запускает тесты со своим кэшем вместо кэша рабочей копии."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._private_cache = private_cache()
+        self._private_cache.__enter__()
+
+    def teardown_test_environment(self, **kwargs):
+        self._private_cache.__exit__(None, None, None)
+        super().teardown_test_environment(**kwargs)
+
+
+def sync_replicas(*aliases):
+    """Копирует основную базу SQLite в файлы реплик через backup API."""
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    for alias in aliases:
+        replica = connections[alias]
+        # Открытое соединение реплики увидело бы файл наполовину.
+        replica.close()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+
+@contextmanager
+def sqlite_replica(alias='replica'):
+    """Подключает временную реплику SQLite с копией основной базы.
+
+    Реплика попадает в REPLICA_DATABASES; догнать её до основной базы
+    можно вызовом sync_replicas(alias).
+    """
+    handle, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(handle)
+    connections.databases[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+    }
+    try:
+        sync_replicas(alias)
+        with override_settings(REPLICA_DATABASES=[alias]):
+            yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+        os.remove(path)
+
+
+@contextmanager
+def run_commit_callbacks(using=DEFAULT_DB_ALIAS):
+    """Выполняет on_commit-колбэки, отложенные внутри блока.
+
+    TestCase держит каждый тест в транзакции, которая не фиксируется,
+    и колбэки сами не срабатывают; блок ведёт себя так, будто его
+    записи закоммичены.
+    """
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    yield
+    callbacks = connection.run_on_commit[start:]
+    del connection.run_on_commit[start:]
+    for _, callback in callbacks:
+        callback()
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.middleware.replicas import PRIMARY_COOKIE
+from core.routers import (PrimaryReplicaRouter, replica_cache_timeout,
+                          replica_reads)
+from core.testing import sqlite_replica, sync_replicas
+from posts import lookups
+from posts.models import Post
+
+User = get_user_model()
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        lookups.local_cache.clear()
+        self.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=self.user, text='Старый пост')
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.profile_url = reverse(
+            'posts:profile', kwargs={'username': 'auth'})
+
+    def test_router_uses_replicas_only_when_allowed(self):
+        """Реплики читаются только внутри replica_reads, сессии — нет."""
+        router = PrimaryReplicaRouter()
+        session_model = self.client.session.__class__.get_model_class()
+        with override_settings(REPLICA_DATABASES=['replica']):
+            self.assertEqual(router.db_for_read(Post), 'default')
+            with replica_reads():
+                self.assertEqual(router.db_for_read(Post), 'replica')
+                self.assertEqual(
+                    router.db_for_read(session_model), 'default')
+                self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'posts'))
+
+    def test_guest_reads_replica_until_synced(self):
+        """Гость видит данные реплики, пока её не догонят."""
+        with sqlite_replica() as alias:
+            Post.objects.create(author=self.user, text='Свежий пост')
+            response = self.guest_client.get(self.profile_url)
+            self.assertContains(response, 'Старый пост')
+            self.assertNotContains(response, 'Свежий пост')
+            sync_replicas(alias)
+            cache.clear()
+            response = self.guest_client.get(self.profile_url)
+            self.assertContains(response, 'Свежий пост')
+
+    def test_author_reads_own_write(self):
+        """После публикации автор читает с основной базы."""
+        with sqlite_replica():
+            response = self.authorized_client.post(
+                reverse('posts:post_create'), {'text': 'Свежий пост'})
+            self.assertIn(PRIMARY_COOKIE, response.cookies)
+            self.assertEqual(
+                response.cookies[PRIMARY_COOKIE]['max-age'],
+                settings.DATABASE_STICKY_SECONDS)
+            response = self.authorized_client.get(self.profile_url)
+            self.assertContains(response, 'Свежий пост')
+            response = self.guest_client.get(self.profile_url)
+            self.assertNotContains(response, 'Свежий пост')
+
+    def test_replica_reads_cached_briefly(self):
+        """Собранное по реплике живёт в кэше не дольше её отставания."""
+        with sqlite_replica(), mock.patch.object(
+                cache, 'set', wraps=cache.set) as cache_set:
+            self.guest_client.get(self.profile_url)
+        timeouts = {
+            key.split(':')[1]: timeout
+            for key, _, timeout, *_ in (
+                call[0] for call in cache_set.call_args_list)
+            if not key.startswith('posts:generation:')
+        }
+        for kind in ('lookup', 'fragment', 'page'):
+            with self.subTest(kind=kind):
+                self.assertEqual(timeouts[kind],
+                                 settings.DATABASE_STICKY_SECONDS)
+        # Без реплик время жизни не меняется.
+        self.assertIsNone(replica_cache_timeout(None))
+
+    def test_search_reads_index_and_posts_from_one_replica(self):
+        """Поиск берёт и индекс, и посты с той же реплики."""
+        with sqlite_replica():
+            Post.objects.filter(text='Старый пост').delete()
+            response = self.guest_client.get(
+                reverse('posts:search'), {'q': 'старый'})
+        self.assertContains(response, 'Старый пост')
@@ -0,0 +1,54 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+
+User = get_user_model()
+
+SERVER_TIMING_RE = re.compile(
+    r'sql;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), '
+    r'view;dur=([\d.]+), total;dur=([\d.]+)'
+)
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def timings(self, response):
+        match = SERVER_TIMING_RE.fullmatch(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        count, *durations = match.groups()
+        return int(count), [float(value) for value in durations]
+
+    def test_header_reports_queries_and_durations(self):
+        """Server-Timing содержит число запросов и длительности этапов."""
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'}))
+        count, (template, view, total) = self.timings(response)
+        self.assertGreater(count, 0)
+        self.assertLessEqual(template, view)
+        self.assertLessEqual(view, total)
+
+    def test_header_on_page_without_queries(self):
+        """Страница без SQL получает нулевой счётчик запросов."""
+        response = Client().get(reverse('about:author'))
+        count, _ = self.timings(response)
+        self.assertEqual(count, 0)
+
+    def test_log_line_names_view(self):
+        """Строка лога содержит имя вьюхи из resolver_match."""
+        with self.assertLogs('yatube.timing', level='INFO') as logs:
+            self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.timing['view'], 'posts:index')
+        self.assertIn('view=posts:index', record.getMessage())
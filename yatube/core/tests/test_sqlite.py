@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.test import TransactionTestCase, override_settings
+
+from core.sqlite import call_with_lock_retries
+from core.testing import sqlite_replica
+
+
+@override_settings(SQLITE_LOCK_RETRY_DELAY=0)
+class SqliteTuningTests(TransactionTestCase):
+    def test_new_connections_get_pragmas(self):
+        """Новое соединение с файлом SQLite получает SQLITE_PRAGMAS."""
+        with sqlite_replica() as alias:
+            with connections[alias].cursor() as cursor:
+                for name, expected in (('journal_mode', 'wal'),
+                                       ('synchronous', 1),
+                                       ('busy_timeout', 5000)):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], expected)
+
+    def test_locked_transaction_retried(self):
+        """Транзакция, упёршаяся в блокировку, повторяется."""
+        calls = []
+
+        def write():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+
+        self.assertEqual(call_with_lock_retries(write), 'ok')
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_not_retried(self):
+        """Прочие ошибки и исчерпанные повторы пробрасываются."""
+        def broken():
+            calls.append(1)
+            raise OperationalError(message)
+
+        for message, attempts in (
+                ('no such table: posts_post', 1),
+                ('database is locked', settings.SQLITE_LOCK_RETRIES + 1)):
+            calls = []
+            with self.subTest(message=message):
+                with self.assertRaises(OperationalError):
+                    call_with_lock_retries(broken)
+                self.assertEqual(len(calls), attempts)
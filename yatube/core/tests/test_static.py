@@ -0,0 +1,86 @@
+import gzip
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.management import call_command
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.test import Client, SimpleTestCase, override_settings
+
+from core.middleware.static import IMMUTABLE_CACHE_CONTROL
+
+
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.css_url = staticfiles_storage.url('css/bootstrap.min.css')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def read(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_hashed_names_and_gzip_copies(self):
+        """collectstatic пишет хэшированные имена и gzip-копии текста."""
+        self.assertRegex(self.css_url,
+                         r'^/static/css/bootstrap\.min\.[0-9a-f]{12}\.css$')
+        hashed_path = staticfiles_storage.path(
+            staticfiles_storage.stored_name('css/bootstrap.min.css'))
+        with open(hashed_path, 'rb') as css, \
+                gzip.open(hashed_path + '.gz') as compressed:
+            self.assertEqual(compressed.read(), css.read())
+        png = staticfiles_storage.path(
+            staticfiles_storage.stored_name('img/logo.png'))
+        self.assertFalse(os.path.exists(png + '.gz'))
+
+    def test_gzip_negotiated(self):
+        """Сжатая копия отдаётся только принимающим gzip клиентам."""
+        client = Client()
+        response = client.get(self.css_url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        compressed = self.read(response)
+        response = client.get(self.css_url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(gzip.decompress(compressed), self.read(response))
+
+    def test_hashed_files_are_immutable(self):
+        """Файлы с хэшем кэшируются навсегда, без хэша — ненадолго."""
+        client = Client()
+        response = client.get(self.css_url)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        response = client.get('/static/css/bootstrap.min.css')
+        self.assertEqual(response['Cache-Control'],
+                         f'public, max-age={settings.STATIC_MAX_AGE}')
+
+    def test_revalidation_not_modified(self):
+        """Повторный запрос с ETag получает 304 без тела."""
+        client = Client()
+        etag = client.get(self.css_url)['ETag']
+        response = client.get(self.css_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_paths_outside_root_not_served(self):
+        """Обход каталога и отсутствующие файлы не отдаются."""
+        client = Client()
+        for url in ('/static/../manage.py', '/static/css/nope.css'):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code,
+                                 HTTPStatus.NOT_FOUND)
@@ -0,0 +1,40 @@
+import copy
+import os
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from core.template.warmup import template_names, warm_templates
+
+
+def cached_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = [(
+        'django.template.loaders.cached.Loader', settings.TEMPLATE_LOADERS,
+    )]
+    return templates
+
+
+class TemplateWarmupTests(SimpleTestCase):
+    def test_all_templates_compile(self):
+        """Команда компилирует каждый файл из templates/."""
+        out = StringIO()
+        with self.assertLogs('yatube.templates', level='INFO'):
+            call_command('warm_templates', stdout=out)
+        expected = sum(
+            len(files) for _, _, files in os.walk(settings.TEMPLATES_DIR))
+        self.assertIn(f'Шаблонов: {expected},', out.getvalue())
+
+    @override_settings(TEMPLATES=cached_templates())
+    def test_warmup_fills_cached_loader(self):
+        """После прогрева кэширующий загрузчик знает все шаблоны."""
+        with self.assertLogs('yatube.templates', level='INFO'):
+            warm_templates()
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertEqual(
+            set(loader.get_template_cache),
+            set(template_names(settings.TEMPLATES_DIR)),
+        )
@@ -1,5 +1,39 @@
-from django.contrib import admin
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.paginator import Paginator
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+from .counting import all_posts_count
 from .models import Post, Group
+from .search import filter_matching
+
+
+class PostChangeListPaginator(Paginator):
+    """Пагинатор списка постов в админке без COUNT(*) по всей таблице.
+
+    Без фильтров число постов берётся из кэша главной страницы.
+    С фильтрами считается не больше ADMIN_COUNT_LIMIT строк, так что
+    дальние страницы широкой выборки недоступны — её стоит сузить.
+    """
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            return all_posts_count()[0]
+        return self.object_list.order_by()[
+            :settings.ADMIN_COUNT_LIMIT].count()
+
+
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        Group.objects.all(), required=False, label='Группа',
+        help_text='Куда перенести посты действием «Перенести в группу»',
+    )
 
 
 @admin.register(Post)
@@ -12,9 +46,104 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
+    # Фильтр по дате строит диапазоны pub_date без подсчёта строк.
     list_filter = ('pub_date',)
+    # Навигация по датам — тег indexed_date_hierarchy в шаблоне
+    # admin/posts/post/change_list.html.
+    date_hierarchy = 'pub_date'
+    paginator = PostChangeListPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
+    action_form = PostActionForm
+    actions = ('move_to_group', 'clear_group', 'delete_posts')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск идёт по FTS5-индексу вместо LIKE '%...%' по всей таблице.
+        if not search_term:
+            return queryset, False
+        return filter_matching(queryset, search_term), False
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+        # Список групп читается один раз, а не в каждой строке;
+        # list() без iter() спросил бы len() — лишний COUNT.
+        field = formset.form.base_fields['group']
+        field.choices = list(iter(field.choices))
+        return formset
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Стандартное удаление грузит каждый пост ради сигналов.
+        actions.pop('delete_selected', None)
+        return actions
+
+    # Действия работают одним запросом над всей выборкой, в том числе
+    # при «выбрать все» на нескольких страницах, и не грузят посты.
+
+    def move_to_group(self, request, queryset):
+        group = Group.objects.filter(pk=request.POST.get('group') or None)
+        group = group.first()
+        if group is None:
+            self.message_user(request, 'Выберите группу для переноса.',
+                              messages.WARNING)
+            return
+        moved = queryset.set_group(group)
+        self.message_user(request, f'Перенесено в «{group}»: {moved}.')
+    move_to_group.short_description = 'Перенести в группу'
+    move_to_group.allowed_permissions = ('change',)
+
+    def clear_group(self, request, queryset):
+        cleared = queryset.set_group(None)
+        self.message_user(request, f'Убрано из групп: {cleared}.')
+    clear_group.short_description = 'Убрать из группы'
+    clear_group.allowed_permissions = ('change',)
+
+    def delete_posts(self, request, queryset):
+        # Удаление необратимо и может захватить все страницы списка,
+        # поэтому сначала — страница подтверждения с числом постов.
+        if not request.POST.get('post'):
+            return self.confirm_delete_posts(request, queryset)
+        deleted = queryset.delete_at_once()
+        if deleted:
+            # Одна запись журнала на всю выборку: по записи на пост
+            # пришлось бы загрузить каждый пост.
+            LogEntry.objects.log_action(
+                user_id=request.user.pk,
+                content_type_id=ContentType.objects.get_for_model(
+                    self.model).pk,
+                object_id=None,
+                object_repr=f'Удалено постов: {deleted}',
+                action_flag=DELETION,
+                change_message=self.deletion_message(request),
+            )
+        self.message_user(request, f'Удалено постов: {deleted}.')
+    delete_posts.short_description = 'Удалить выбранные посты'
+    delete_posts.allowed_permissions = ('delete',)
+
+    def confirm_delete_posts(self, request, queryset):
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Удалить посты?',
+            'opts': self.model._meta,
+            'media': self.media,
+            'posts_count': queryset.count(),
+            'selected': request.POST.getlist(ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+            'action_checkbox_name': ACTION_CHECKBOX_NAME,
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, 'admin/posts/post/delete_posts_confirmation.html',
+            context)
+
+    def deletion_message(self, request):
+        if request.POST.get('select_across') == '1':
+            filters = request.GET.urlencode()
+            return f'Все посты списка{f" ({filters})" if filters else ""}'
+        selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
+        return 'Выбранные посты: ' + ', '.join(selected)
 
 
 admin.site.register(Group)
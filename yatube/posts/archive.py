@@ -0,0 +1,183 @@
+import datetime
+from collections import Counter
+
+from django.db import connections, transaction
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Concat, TruncDate
+from django.utils import timezone
+
+from .models import Post, PostArchiveDay
+
+ALL_SCOPE = 'all'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def owner_scopes(author_id, group_id):
+    scopes = [ALL_SCOPE, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def publication_day(post):
+    return timezone.localtime(post.pub_date).date()
+
+
+def count_days(rows, sign=1):
+    """Изменения дней архива по четвёркам (автор, группа, день, постов)."""
+    deltas = Counter()
+    for author_id, group_id, day, total in rows:
+        for scope in owner_scopes(author_id, group_id):
+            deltas[scope, day] += sign * total
+    return deltas
+
+
+def count_posts(posts, sign=1):
+    return count_days(((post.author_id, post.group_id, publication_day(post),
+                        1) for post in posts), sign)
+
+
+def change_day(scope, day, delta):
+    """Сдвигает число постов дня области на delta."""
+    if not delta:
+        return
+    days = PostArchiveDay.objects.filter(scope=scope, day=day)
+    if delta < 0:
+        days = days.filter(posts_count__gte=-delta)
+    if days.update(posts_count=F('posts_count') + delta) or delta < 0:
+        return
+    _, created = PostArchiveDay.objects.get_or_create(
+        scope=scope, day=day, defaults={'posts_count': delta})
+    if not created:
+        PostArchiveDay.objects.filter(scope=scope, day=day).update(
+            posts_count=F('posts_count') + delta)
+
+
+def apply_deltas(deltas):
+    with transaction.atomic():
+        for (scope, day), delta in deltas.items():
+            change_day(scope, day, delta)
+
+
+# Числа постов в SELECT всегда положительны: CHECK (posts_count >= 0)
+# проверяется раньше ON CONFLICT. Уменьшение не создаёт строк и не
+# опускает счётчик ниже нуля.
+SHIFT_DAYS_SQL = (
+    'INSERT INTO {table} (scope, day, posts_count) '
+    'SELECT scope, day, total FROM ({rows}) AS shifted WHERE {condition} '
+    'ON CONFLICT (scope, day) DO UPDATE '
+    'SET posts_count = MAX({table}.posts_count {sign} excluded.posts_count, 0)'
+)
+EXISTING_DAY_SQL = (
+    'EXISTS (SELECT 1 FROM {table} WHERE {table}.scope = shifted.scope '
+    'AND {table}.day = shifted.day)'
+)
+
+
+def scope_of(prefix, field):
+    """Выражение области архива по полю строки поста."""
+    return Concat(Value(prefix), field, output_field=CharField())
+
+
+def shift_days(posts, scope, sign=1):
+    """Сдвигает дни области на посты выборки одним INSERT ... SELECT.
+
+    scope — выражение области по строке поста; посты не загружаются.
+    """
+    rows = (posts.order_by().annotate(scope=scope, day=TruncDate('pub_date'))
+            .values_list('scope', 'day')
+            .annotate(total=Count('pk')))
+    query, params = rows.query.sql_with_params()
+    connection = connections[posts.db]
+    table = connection.ops.quote_name(PostArchiveDay._meta.db_table)
+    condition = '1' if sign > 0 else EXISTING_DAY_SQL.format(table=table)
+    with connection.cursor() as cursor:
+        cursor.execute(SHIFT_DAYS_SQL.format(
+            table=table, rows=query, condition=condition,
+            sign='+' if sign > 0 else '-'), params)
+
+
+def remove_posts(posts, authors=True):
+    """Вычитает выборку из дней архива: по запросу на вид области.
+
+    authors=False оставляет области сайта и авторов как есть — при
+    переносе между группами меняются только области групп.
+    """
+    with transaction.atomic(using=posts.db):
+        if authors:
+            shift_days(posts, Value(ALL_SCOPE, output_field=CharField()),
+                       sign=-1)
+            shift_days(posts, scope_of('author:', 'author_id'), sign=-1)
+        shift_days(posts.filter(group__isnull=False),
+                   scope_of('group:', 'group_id'), sign=-1)
+
+
+def add_to_group(posts, group_id):
+    """Добавляет выборку в дни архива группы group_id."""
+    shift_days(posts, Value(group_scope(group_id), output_field=CharField()))
+
+
+def rebuild():
+    """Пересчитывает таблицу дней архива по постам; возвращает число дней."""
+    rows = (Post.objects.order_by().annotate(day=TruncDate('pub_date'))
+            .values_list('author_id', 'group_id', 'day')
+            .annotate(total=Count('pk')))
+    with transaction.atomic():
+        PostArchiveDay.objects.all().delete()
+        days = PostArchiveDay.objects.bulk_create(
+            PostArchiveDay(scope=scope, day=day, posts_count=total)
+            for (scope, day), total in count_days(rows).items()
+        )
+    return len(days)
+
+
+def period_bounds(year, month=None, day=None):
+    """Первый день периода и первый день следующего за ним.
+
+    Для несуществующей даты и периода в конце 9999 года — ValueError.
+    """
+    try:
+        if day is not None:
+            start = datetime.date(year, month, day)
+            return start, start + datetime.timedelta(days=1)
+        if month is not None:
+            start = datetime.date(year, month, 1)
+            return start, (start + datetime.timedelta(days=32)).replace(
+                day=1)
+        start = datetime.date(year, 1, 1)
+        return start, start.replace(year=year + 1)
+    except OverflowError as error:
+        raise ValueError(error) from error
+
+
+def day_start(day):
+    """Начало дня в текущем часовом поясе — граница диапазона pub_date."""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+
+
+def posts_between(queryset, start, end):
+    """Посты за дни [start, end): диапазон по индексу, без __year."""
+    return queryset.filter(pub_date__gte=day_start(start),
+                           pub_date__lt=day_start(end))
+
+
+def day_counts(scope, start, end):
+    """Непустые дни области в [start, end) с числом постов."""
+    return list(PostArchiveDay.objects.filter(
+        scope=scope, day__gte=start, day__lt=end, posts_count__gt=0,
+    ).order_by('day').values_list('day', 'posts_count'))
+
+
+def month_counts(days):
+    """Сворачивает дни в месяцы: [(первое число месяца, постов)]."""
+    months = Counter()
+    for day, total in days:
+        months[day.replace(day=1)] += total
+    return sorted(months.items())
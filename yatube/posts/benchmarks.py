@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from faker import Faker
+from mixer.backend.django import mixer
+
+from core.cache import private_cache
+
+from .models import Group, Post, User
+
+SEED_BATCH_SIZE = 5000
+
+
+@contextmanager
+def temporary_database(test_name=None):
+    """Создаёт отдельную тестовую базу и кэш на время замера.
+
+    Рабочая база не затрагивается: данные сидятся в test_-копию,
+    которая удаляется после выхода из блока. test_name задаёт файл
+    копии; без него SQLite держит её в памяти. Страницы и карточки
+    замера пишутся во временный кэш, а не в общий кэш сервера.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings['NAME']
+    test_settings['NAME'] = test_name or old_test_name
+    # createcachetable внутри create_test_db уже открывает кэш.
+    with private_cache():
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = old_test_name
+
+
+def seed_owners(authors=100, groups=20, locale='ru_RU'):
+    """Создаёт авторов и группы для постов; возвращает их id."""
+    mixer.faker.locale = locale
+    author_ids = [
+        user.pk for user in mixer.cycle(authors).blend(
+            User, username=mixer.sequence('author{0}'))
+    ]
+    group_ids = [
+        group.pk for group in mixer.cycle(groups).blend(
+            Group, slug=mixer.sequence('group-{0}'))
+    ]
+    return author_ids, group_ids
+
+
+def seed_posts(count, author_ids, group_ids, seed=0, locale='ru_RU'):
+    """Добавляет count постов случайных авторов и групп (или без группы)."""
+    fake = Faker(locale)
+    fake.seed_instance(seed)
+    rnd = random.Random(seed)
+    group_ids = [None] + list(group_ids)
+    sentences = [fake.sentence(nb_words=12) for _ in range(2000)]
+    created = 0
+    while created < count:
+        size = min(SEED_BATCH_SIZE, count - created)
+        Post.objects.bulk_create([Post(
+            text=' '.join(rnd.sample(sentences, rnd.randint(1, 6))),
+            author_id=rnd.choice(author_ids),
+            group_id=rnd.choice(group_ids),
+        ) for _ in range(size)])
+        created += size
+
+
+def measure(func, repeat):
+    """Выполняет func repeat раз и возвращает длительности в мс."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentile(timings, share):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(timings):
+    return {
+        'p50': statistics.median(timings),
+        'p95': percentile(timings, 0.95),
+        'p99': percentile(timings, 0.99),
+    }
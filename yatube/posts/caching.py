@@ -0,0 +1,216 @@
+import itertools
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+
+from core.routers import replica_cache_timeout
+
+FRAGMENT_TEMPLATE = 'posts/includes/posts_list.html'
+FRAGMENT_HITS_KEY = 'posts:fragment:hits'
+FRAGMENT_MISSES_KEY = 'posts:fragment:misses'
+# Поколение, общее для всех страниц: меняется при правке групп и авторов.
+ALL_PAGES_SCOPE = 'pages'
+INDEX_PAGE_SCOPE = 'index-page'
+
+
+# Сдвиги поколений, сделанные этим процессом: по ним кэши в памяти
+# процесса сразу видят свои записи, не обращаясь к общему кэшу.
+_local_bumps = {}
+_bump_numbers = itertools.count(1)
+
+# Попадания и промахи карточек, ещё не слитые в общий кэш.
+_pending_counts = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def generation_key(scope):
+    return f'posts:generation:{scope}'
+
+
+def get_generations(*scopes):
+    """Возвращает текущие поколения областей кэша.
+
+    Отсутствующее поколение заводится от текущего времени, чтобы после
+    вытеснения ключа не совпасть со старыми записями.
+    """
+    keys = [generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_generations(*scopes):
+    """Сдвигает поколения: все записи этих областей устаревают.
+
+    Внутри транзакции сдвиг ждёт коммита. Иначе чтение, попавшее между
+    сдвигом и коммитом, видит старые строки и кладёт их в кэш под
+    новым поколением, где они живут до конца своего таймаута.
+    """
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def _bump(scopes):
+    for scope in scopes:
+        _local_bumps[scope] = next(_bump_numbers)
+        key = generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def local_generations(*scopes):
+    """Поколения областей с точки зрения этого процесса, без общего кэша.
+
+    Меняются только при сдвигах в этом же процессе; чужие сдвиги
+    видны по get_generations.
+    """
+    return tuple(_local_bumps.get(scope, 0) for scope in scopes)
+
+
+def _count(key):
+    """Считает попадание или промах в памяти процесса.
+
+    incr на файловом кэше — чтение и запись файла без блокировки, по
+    разу на каждую карточку страницы. Поэтому счётчики сливаются в
+    общий кэш пачкой, раз в FRAGMENT_STATS_FLUSH_EVERY отрисовок или
+    FRAGMENT_STATS_FLUSH_SECONDS секунд. Доля попаданий приблизительна:
+    несохранённый остаток процесса теряется при его остановке, а на
+    кэшах без атомарного incr (всех, кроме memcached) параллельные
+    слияния могут затереть друг друга.
+    """
+    with _pending_lock:
+        _pending_counts[key] += 1
+        if (sum(_pending_counts.values())
+                < settings.FRAGMENT_STATS_FLUSH_EVERY
+                and time.monotonic() - _last_flush
+                < settings.FRAGMENT_STATS_FLUSH_SECONDS):
+            return
+    flush_fragment_stats()
+
+
+def flush_fragment_stats():
+    """Сливает накопленные процессом счётчики карточек в общий кэш."""
+    global _last_flush
+    with _pending_lock:
+        counts = dict(_pending_counts)
+        _pending_counts.clear()
+        _last_flush = time.monotonic()
+    for key, delta in counts.items():
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            if not cache.add(key, delta, None):
+                cache.incr(key, delta)
+
+
+def fragment_key(post):
+    generations = get_generations(
+        f'post:{post.pk}',
+        f'author:{post.author_id}',
+        f'group:{post.group_id}',
+    )
+    stamp = post.pub_date.timestamp()
+    return 'posts:fragment:{}:{}:{}'.format(
+        post.pk, stamp, ':'.join(map(str, generations))
+    )
+
+
+def render_post_fragment(post):
+    """Отдаёт HTML карточки поста из кэша, отрисовывая при промахе."""
+    key = fragment_key(post)
+    html = cache.get(key)
+    if html is not None:
+        _count(FRAGMENT_HITS_KEY)
+        return html
+    _count(FRAGMENT_MISSES_KEY)
+    html = render_to_string(FRAGMENT_TEMPLATE, {'post': post})
+    cache.set(key, html,
+              replica_cache_timeout(settings.POST_FRAGMENT_TIMEOUT))
+    return html
+
+
+def fragment_stats():
+    """Возвращает число попаданий, промахов и долю попаданий.
+
+    Учитывает слитое в общий кэш всеми процессами и остаток текущего.
+    """
+    flush_fragment_stats()
+    counts = cache.get_many([FRAGMENT_HITS_KEY, FRAGMENT_MISSES_KEY])
+    hits = counts.get(FRAGMENT_HITS_KEY, 0)
+    misses = counts.get(FRAGMENT_MISSES_KEY, 0)
+    total = hits + misses
+    return hits, misses, hits / total if total else 0.0
+
+
+def reset_fragment_stats():
+    with _pending_lock:
+        _pending_counts.clear()
+    cache.delete_many([FRAGMENT_HITS_KEY, FRAGMENT_MISSES_KEY])
+
+
+def group_page_scope(slug):
+    return f'group-page:{slug}'
+
+
+def author_page_scope(username):
+    return f'author-page:{username}'
+
+
+def archive_page_scope(slug=None, username=None, **kwargs):
+    """Страницы архива устаревают вместе с лентой своего владельца."""
+    if slug is not None:
+        return group_page_scope(slug)
+    if username is not None:
+        return author_page_scope(username)
+    return INDEX_PAGE_SCOPE
+
+
+def page_key(request, scope):
+    generations = get_generations(ALL_PAGES_SCOPE, scope)
+    return 'posts:page:{}:{}:{}:{}'.format(
+        request.path,
+        request.GET.get('page', ''),
+        request.GET.get('cursor', ''),
+        ':'.join(map(str, generations)),
+    )
+
+
+def cache_anonymous_page(scope):
+    """Кэширует страницу целиком для анонимных пользователей.
+
+    scope получает именованные аргументы вьюхи и возвращает область
+    кэша; запись постов сдвигает поколения затронутых областей.
+    Условные запросы к закэшированной странице проверяются по её
+    сохранённому ETag без обращения к базе.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            key = page_key(request, scope(**kwargs))
+            response = cache.get(key)
+            if response is not None:
+                return get_conditional_response(
+                    request, etag=response.get('ETag'), response=response)
+            response = view(request, *args, **kwargs)
+            if response.status_code == HTTPStatus.OK:
+                cache.set(key, response,
+                          replica_cache_timeout(settings.PAGE_CACHE_TIMEOUT))
+            return response
+        return wrapper
+    return decorator
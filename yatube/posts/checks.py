@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Error, Tags, register
+
+# Бэкенды, которые хранят записи в памяти одного процесса.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def cache_backend():
+    return settings.CACHES.get(DEFAULT_CACHE_ALIAS, {}).get('BACKEND')
+
+
+def is_process_local_cache():
+    return cache_backend() in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Поколения кэша должны быть общими для всех процессов.
+
+    Иначе сдвиг поколения в одном процессе не доходит до остальных,
+    и они отдают старые карточки, страницы и 304.
+    """
+    backend = cache_backend()
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        f'Кэш {backend} виден только своему процессу.',
+        hint=('Укажите в CACHES общий бэкенд (файловый, memcached). '
+              'Единственный процесс сервера может отключить проверку '
+              'через SILENCED_SYSTEM_CHECKS.'),
+        id='posts.E001',
+    )]
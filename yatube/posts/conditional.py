@@ -0,0 +1,68 @@
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .caching import (ALL_PAGES_SCOPE, INDEX_PAGE_SCOPE, author_page_scope,
+                      get_generations, group_page_scope)
+from .lookups import get_author, get_group
+from .models import Post
+
+
+def index_state():
+    return [INDEX_PAGE_SCOPE]
+
+
+def group_state(slug):
+    get_group(slug)
+    return [group_page_scope(slug)]
+
+
+def author_state(username):
+    get_author(username)
+    return [author_page_scope(username)]
+
+
+def post_state(post_id):
+    username = Post.objects.filter(pk=post_id).values_list(
+        'author__username', flat=True).first()
+    if username is None:
+        return None
+    # На странице поста выводится и число постов автора.
+    return [f'post:{post_id}', author_page_scope(username)]
+
+
+def conditional_page(state):
+    """Отвечает 304, если у клиента актуальная версия страницы.
+
+    state получает именованные аргументы вьюхи и возвращает области
+    кэша страницы либо None (или Http404), если объекта нет; группу и
+    автора он берёт из кэша поиска, так что база обычно не нужна.
+    ETag собирается из поколений областей и меняется при любой записи.
+    Last-Modified не отдаётся: после удаления свежего поста или
+    переименования группы дата свежей правки не растёт, и ответ по
+    If-Modified-Since был бы устаревшим.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            scopes = state(**kwargs)
+            if scopes is None:
+                return view(request, *args, **kwargs)
+            generations = get_generations(ALL_PAGES_SCOPE, *scopes)
+            etag = quote_etag(hashlib.md5('{}:{}'.format(
+                request.user.pk or 0, ':'.join(map(str, generations)),
+            ).encode()).hexdigest())
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (HTTPStatus.OK,
+                                        HTTPStatus.NOT_MODIFIED):
+                response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
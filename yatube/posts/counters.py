@@ -0,0 +1,116 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import (Count, F, OuterRef, PositiveIntegerField,
+                              Subquery)
+from django.db.models.functions import Greatest
+
+from .models import AuthorStats, Group, Post, User
+
+
+def change_author_posts(author_id, delta):
+    """Сдвигает счётчик постов автора на delta."""
+    if not delta:
+        return
+    stats = AuthorStats.objects.filter(author_id=author_id)
+    if delta < 0:
+        stats = stats.filter(posts_count__gte=-delta)
+    if stats.update(posts_count=F('posts_count') + delta) or delta < 0:
+        return
+    _, created = AuthorStats.objects.get_or_create(
+        author_id=author_id, defaults={'posts_count': delta}
+    )
+    if not created:
+        AuthorStats.objects.filter(author_id=author_id).update(
+            posts_count=F('posts_count') + delta
+        )
+
+
+def change_group_posts(group_id, delta):
+    """Сдвигает счётчик постов группы на delta."""
+    if not delta or group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F('posts_count') + delta)
+
+
+def apply_deltas(author_deltas, group_deltas):
+    """Применяет накопленные изменения счётчиков одной транзакцией."""
+    with transaction.atomic():
+        for author_id, delta in author_deltas.items():
+            change_author_posts(author_id, delta)
+        for group_id, delta in group_deltas.items():
+            change_group_posts(group_id, delta)
+
+
+def count_posts(posts, sign=1):
+    """Возвращает изменения счётчиков для набора постов."""
+    author_deltas, group_deltas = Counter(), Counter()
+    for post in posts:
+        author_deltas[post.author_id] += sign
+        if post.group_id is not None:
+            group_deltas[post.group_id] += sign
+    return author_deltas, group_deltas
+
+
+def posts_per_owner(posts, field):
+    """Подзапрос: число постов выборки у владельца внешней строки."""
+    return Subquery(
+        posts.filter(**{field: OuterRef('pk')}).order_by().values(field)
+        .annotate(total=Count('pk')).values('total'),
+        output_field=PositiveIntegerField(),
+    )
+
+
+def remove_posts(posts, authors=True):
+    """Вычитает выборку постов из счётчиков групп и авторов.
+
+    По одному UPDATE на вид счётчика, сколько бы постов и владельцев ни
+    было в выборке; authors=False оставляет счётчики авторов как есть.
+    """
+    Group.objects.filter(pk__in=posts.values('group_id')).update(
+        posts_count=Greatest(
+            F('posts_count') - posts_per_owner(posts, 'group'), 0))
+    if authors:
+        AuthorStats.objects.filter(
+            author_id__in=posts.values('author_id')).update(
+            posts_count=Greatest(
+                F('posts_count') - posts_per_owner(posts, 'author'), 0))
+
+
+def recount():
+    """Сверяет счётчики с таблицей постов и исправляет расхождения.
+
+    Возвращает число исправленных авторов и групп.
+    """
+    with transaction.atomic():
+        author_counts = dict(
+            Post.objects.order_by().values_list('author')
+            .annotate(total=Count('pk'))
+        )
+        group_counts = dict(
+            Post.objects.order_by().filter(group__isnull=False)
+            .values_list('group').annotate(total=Count('pk'))
+        )
+        stored = dict(
+            AuthorStats.objects.values_list('author_id', 'posts_count')
+        )
+        fixed_authors = 0
+        for author_id in User.objects.values_list('pk', flat=True):
+            actual = author_counts.get(author_id, 0)
+            if stored.get(author_id) == actual:
+                continue
+            AuthorStats.objects.update_or_create(
+                author_id=author_id, defaults={'posts_count': actual}
+            )
+            fixed_authors += 1
+        fixed_groups = 0
+        for group_id, stored_count in Group.objects.values_list(
+                'pk', 'posts_count'):
+            actual = group_counts.get(group_id, 0)
+            if stored_count != actual:
+                Group.objects.filter(pk=group_id).update(posts_count=actual)
+                fixed_groups += 1
+    return fixed_authors, fixed_groups
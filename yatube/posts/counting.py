@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from core.routers import replica_cache_timeout
+
+from .models import Post
+
+ALL_POSTS_COUNT_KEY = 'posts:count:all'
+
+
+def stored_count(value):
+    """Число из счётчика в базе: точное и уже загруженное с объектом."""
+    return lambda: (value, True)
+
+
+def all_posts_count():
+    """Возвращает (число постов, точное ли оно) для главной страницы.
+
+    Точное число берётся из кэша. При промахе, если включён порог
+    PAGINATION_ESTIMATE_THRESHOLD и максимальный id поста выше него,
+    отдаётся оценка: id не меньше числа строк, поэтому по ней глубокие
+    страницы не теряются, а пустой хвост исправляет CountedPaginator.
+    """
+    count = cache.get(ALL_POSTS_COUNT_KEY)
+    if count is not None:
+        return count, True
+    threshold = settings.PAGINATION_ESTIMATE_THRESHOLD
+    if threshold is not None:
+        estimate = Post.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0
+        if estimate > threshold:
+            return estimate, False
+    count = Post.objects.count()
+    remember_all_posts_count(count)
+    return count, True
+
+
+def remember_all_posts_count(count):
+    cache.set(ALL_POSTS_COUNT_KEY, count,
+              replica_cache_timeout(settings.POSTS_COUNT_TIMEOUT))
+
+
+def expire_all_posts_count():
+    # Как и поколения кэша, число сбрасывается только после коммита.
+    transaction.on_commit(lambda: cache.delete(ALL_POSTS_COUNT_KEY))
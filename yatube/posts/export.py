@@ -0,0 +1,66 @@
+import csv
+import json
+
+from django.conf import settings
+
+EXPORT_FIELDS = ('id', 'pub_date', 'group', 'text')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def iter_author_posts(author, chunk_size=None):
+    """Отдаёт посты автора по возрастанию даты порциями по chunk_size.
+
+    Каждая порция — отдельный запрос по ключу (pub_date, id), поэтому
+    в памяти держится не больше одной порции, а запросы идут по индексу
+    (author_id, pub_date) без OFFSET.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = author.posts.order_by('pub_date', 'pk').values_list(
+        'pk', 'pub_date', 'group__slug', 'text')
+    chunk = list(rows[:chunk_size])
+    while chunk:
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        pk, pub_date = chunk[-1][:2]
+        chunk = list(
+            rows.filter(pub_date__gte=pub_date).exclude(
+                pub_date=pub_date, pk__lte=pk)[:chunk_size]
+        )
+
+
+def ndjson_lines(rows):
+    for pk, pub_date, group, text in rows:
+        yield json.dumps({
+            'id': pk,
+            'pub_date': pub_date.isoformat(),
+            'group': group,
+            'text': text,
+        }, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """Файлоподобный объект, который отдаёт записанную строку обратно."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for pk, pub_date, group, text in rows:
+        yield writer.writerow((pk, pub_date.isoformat(), group or '', text))
+
+
+FORMATTERS = {
+    'ndjson': ndjson_lines,
+    'csv': csv_lines,
+}
+
+
+def export_lines(author, export_format, chunk_size=None):
+    return FORMATTERS[export_format](iter_author_posts(author, chunk_size))
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .caching import (author_page_scope, bump_generations,
+                      group_page_scope)
+from .models import Group, Post, User
+
+
+class ImportStats:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.imported / elapsed if elapsed else 0.0
+
+
+class Checkpoint:
+    """Смещение и номер строки, до которых файл уже импортирован.
+
+    Запись атомарна (временный файл + os.replace), поэтому после сбоя
+    в файле всегда лежит граница последней закоммиченной порции.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return 0, 0
+        with open(self.path) as checkpoint:
+            position = json.load(checkpoint)
+        return position['offset'], position['line']
+
+    def save(self, offset, line_no):
+        if not self.path:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as checkpoint:
+            json.dump({'offset': offset, 'line': line_no}, checkpoint)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PostImporter:
+    """Потоковый импорт постов из NDJSON.
+
+    Строка файла — объект {"author": ..., "text": ..., "group": ...,
+    "pub_date": ...}; group и pub_date необязательны. Файл читается
+    построчно, посты пишутся порциями bulk_create, каждая порция —
+    в своей транзакции, после которой сохраняется контрольная точка.
+    """
+
+    def __init__(self, batch_size=5000, create_missing=False,
+                 checkpoint=None, on_error=None, on_batch=None):
+        self.batch_size = batch_size
+        self.create_missing = create_missing
+        self.checkpoint = Checkpoint(checkpoint)
+        self.on_error = on_error or (lambda line_no, message: None)
+        self.on_batch = on_batch or (lambda stats: None)
+        self.authors = {}
+        self.groups = {}
+        self.stats = ImportStats()
+
+    def run(self, path):
+        offset, line_no = self.checkpoint.load()
+        batch = []
+        with open(path, 'rb') as source:
+            source.seek(offset)
+            for line_no, line in enumerate(source, start=line_no + 1):
+                offset += len(line)
+                record = self.parse(line_no, line)
+                if record is not None:
+                    batch.append(record)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch, offset, line_no)
+                    batch = []
+        self.flush(batch, offset, line_no)
+        self.checkpoint.clear()
+        return self.stats
+
+    def parse(self, line_no, line):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+            author, text = record['author'], record['text']
+            group = record.get('group') or None
+            pub_date = record.get('pub_date')
+            if pub_date is not None:
+                pub_date = parse_datetime(pub_date)
+                if pub_date is None:
+                    raise ValueError('неверный формат pub_date')
+                if timezone.is_naive(pub_date):
+                    pub_date = timezone.make_aware(pub_date)
+        except (ValueError, KeyError, TypeError) as error:
+            self.reject(line_no, f'некорректная запись: {error}')
+            return None
+        if not isinstance(author, str) or not isinstance(group,
+                                                         (str, type(None))):
+            self.reject(line_no, 'author и group должны быть строками')
+            return None
+        if not isinstance(text, str) or not text.strip():
+            self.reject(line_no, 'пустой текст')
+            return None
+        return line_no, author, group, text, pub_date
+
+    def reject(self, line_no, message):
+        self.stats.rejected += 1
+        self.on_error(line_no, message)
+
+    def resolve(self, batch):
+        """Подгружает id авторов и групп порции одним запросом на модель."""
+        usernames = {author for _, author, *_ in batch} - set(self.authors)
+        slugs = {group for *_, group, _, _ in batch if group}
+        slugs -= set(self.groups)
+        if usernames:
+            self.authors.update(User.objects.filter(
+                username__in=usernames).values_list('username', 'pk'))
+        if slugs:
+            self.groups.update(Group.objects.filter(
+                slug__in=slugs).values_list('slug', 'pk'))
+        if not self.create_missing:
+            return
+        missing_users = usernames - set(self.authors)
+        if missing_users:
+            users = [User(username=username) for username in missing_users]
+            for user in users:
+                user.set_unusable_password()
+            User.objects.bulk_create(users)
+            # bulk_create не шлёт post_save: снимаем отрицательные
+            # записи кэша поиска по этим именам вручную.
+            bump_generations(*map(author_page_scope, missing_users))
+            self.authors.update(User.objects.filter(
+                username__in=missing_users).values_list('username', 'pk'))
+        missing_groups = slugs - set(self.groups)
+        if missing_groups:
+            Group.objects.bulk_create([
+                Group(title=slug, slug=slug, description='')
+                for slug in missing_groups
+            ])
+            bump_generations(*map(group_page_scope, missing_groups))
+            self.groups.update(Group.objects.filter(
+                slug__in=missing_groups).values_list('slug', 'pk'))
+
+    def build(self, batch):
+        now = timezone.now()
+        posts = []
+        for line_no, author, group, text, pub_date in batch:
+            if author not in self.authors:
+                self.reject(line_no, f'нет автора {author}')
+                continue
+            if group and group not in self.groups:
+                self.reject(line_no, f'нет группы {group}')
+                continue
+            posts.append(Post(author_id=self.authors[author],
+                              group_id=self.groups.get(group), text=text,
+                              pub_date=pub_date or now))
+        return posts
+
+    def flush(self, batch, offset, line_no):
+        posts = []
+        if batch:
+            with transaction.atomic():
+                self.resolve(batch)
+                posts = self.build(batch)
+                if posts:
+                    # Без keep_pub_date auto_now_add перезаписал бы
+                    # исходные даты постов.
+                    Post.objects.bulk_create(
+                        posts, batch_size=self.batch_size,
+                        keep_pub_date=True)
+        self.checkpoint.save(offset, line_no)
+        self.stats.imported += len(posts)
+        self.on_batch(self.stats)
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.http import Http404
+
+from core.routers import replica_cache_timeout
+
+from .caching import (ALL_PAGES_SCOPE, author_page_scope, get_generations,
+                      group_page_scope, local_generations)
+from .models import AuthorStats, Group, User
+
+# Отметка «объекта нет» для отрицательного кэширования.
+MISSING = ()
+
+
+class LRUCache:
+    """Потокобезопасный LRU-словарь ограниченного размера."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LRUCache(settings.LOOKUP_CACHE_SIZE)
+
+# Поля, которые видят ленты и их заголовки; пароль и почта автора
+# в кэш не попадают. Порядок — как у полей модели (Model.from_db).
+GROUP_FIELDS = ('id', 'title', 'slug', 'description', 'posts_count')
+AUTHOR_FIELDS = ('id', 'username', 'first_name', 'last_name')
+
+
+def cached_lookup(kind, key, scope, fetch):
+    """Достаёт строку полей объекта по естественному ключу.
+
+    Первый уровень — LRU в памяти процесса: его запись служит без
+    обращений к общему кэшу LOOKUP_LOCAL_TIMEOUT секунд, пока этот же
+    процесс не сдвинул поколения ALL_PAGES_SCOPE или scope. Второй —
+    общий кэш с записями, привязанными к поколениям, которые сдвигают
+    сигналы записи групп, авторов и постов в любом процессе.
+    Отсутствующий объект тоже кэшируется и даёт Http404.
+    """
+    scopes = (ALL_PAGES_SCOPE, scope)
+    local_key = (kind, key)
+    local_state = local_generations(*scopes)
+    entry = local_cache.get(local_key)
+    if (entry is not None and entry[0] == local_state
+            and time.monotonic() - entry[1] < settings.LOOKUP_LOCAL_TIMEOUT):
+        row = entry[2]
+    else:
+        shared_key = 'posts:lookup:{}:{}:{}'.format(
+            kind, key, ':'.join(map(str, get_generations(*scopes))))
+        row = cache.get(shared_key)
+        if row is None:
+            row = fetch() or MISSING
+            cache.set(shared_key, row,
+                      replica_cache_timeout(settings.LOOKUP_CACHE_TIMEOUT))
+        local_cache.set(local_key, (local_state, time.monotonic(), row))
+    if row == MISSING:
+        raise Http404(f'Не найдено: {key}')
+    return row
+
+
+def get_group(slug):
+    """Группа по slug; Http404, если её нет."""
+    row = cached_lookup(
+        'group', slug, group_page_scope(slug),
+        lambda: Group.objects.filter(slug=slug).values_list(
+            *GROUP_FIELDS).first(),
+    )
+    return Group.from_db(router.db_for_read(Group), GROUP_FIELDS, row)
+
+
+def get_author(username):
+    """Пользователь со статистикой по username; Http404, если его нет.
+
+    Остальные поля пользователя отложены и читаются из базы по
+    обращению.
+    """
+    row = cached_lookup(
+        'user', username, author_page_scope(username),
+        lambda: User.objects.filter(username=username).values_list(
+            *AUTHOR_FIELDS, 'stats__posts_count').first(),
+    )
+    *fields, posts_count = row
+    db = router.db_for_read(User)
+    author = User.from_db(db, AUTHOR_FIELDS, fields)
+    stats = None
+    if posts_count is not None:
+        stats = AuthorStats.from_db(db, ('author_id', 'posts_count'),
+                                    (author.pk, posts_count))
+    User.stats.related.set_cached_value(author, stats)
+    return author
@@ -0,0 +1,93 @@
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.admin import PostAdmin
+from posts.benchmarks import (measure, seed_owners, seed_posts, summarize,
+                              temporary_database)
+from posts.models import Post, User
+
+
+class StockPostAdmin(admin.ModelAdmin):
+    """Настройки списка постов до оптимизации — база для сравнения."""
+
+    change_list_template = 'admin/change_list.html'
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_editable = ('group',)
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+    get_search_results = PostAdmin.get_search_results
+
+
+class Command(BaseCommand):
+    help = ('Замеряет список постов в админке на большой базе '
+            'с прежними и текущими настройками PostAdmin.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000,
+                            help='Число постов в базе.')
+        parser.add_argument('--requests', type=int, default=10,
+                            help='Запросов к каждой странице.')
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            author_ids, group_ids = seed_owners()
+            self.stdout.write(f'Наполняю базу до {options["posts"]} '
+                              'постов...')
+            seed_posts(options['posts'], author_ids, group_ids)
+            self.spread_pub_dates()
+            user = User.objects.create_superuser(
+                'bench-admin', 'admin@example.com', 'bench')
+            self.stdout.write('настройки   страница        p50, мс   '
+                              'p95, мс  запросов')
+            for name, admin_class in (('stock', StockPostAdmin),
+                                      ('current', PostAdmin)):
+                cache.clear()
+                self.run_admin(name, admin_class(Post, admin.site), user,
+                               options['requests'])
+
+    def spread_pub_dates(self):
+        # Посты сидятся одной датой; разносим их по пять минут назад
+        # от самого нового, чтобы навигации по датам было что показать.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE posts_post SET pub_date = datetime('now', '-' || "
+                "(((SELECT MAX(id) FROM posts_post) - id) * 5) || "
+                "' minutes')")
+
+    def targets(self):
+        url = reverse('admin:posts_post_changelist')
+        newest = Post.objects.order_by('-pub_date').first().pub_date
+        year, month = newest.year, newest.month
+        # Страница за концом списка отдаёт редирект вместо списка.
+        last_page = (Post.objects.count() - 1) // PostAdmin.list_per_page
+        return {
+            'list': url,
+            'list_deep': f'{url}?p={min(200, last_page)}',
+            'year': f'{url}?pub_date__year={year}',
+            'month': f'{url}?pub_date__year={year}&pub_date__month={month}',
+            'search': f'{url}?q=пост',
+        }
+
+    def run_admin(self, name, model_admin, user, requests):
+        factory = RequestFactory()
+        for page, url in self.targets().items():
+            def request():
+                # Вьюха вызывается напрямую: URL админки привязаны
+                # к зарегистрированному экземпляру PostAdmin.
+                request = factory.get(url)
+                request.user = user
+                model_admin.changelist_view(request).render()
+
+            request()
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                request()
+            stats = summarize(measure(request, requests))
+            self.stdout.write(
+                '{:<12}{:<12}{p50:>11.2f}{p95:>10.2f}{:>10}'.format(
+                    name, page, len(queries.captured_queries), **stats))
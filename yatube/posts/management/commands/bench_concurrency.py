@@ -0,0 +1,148 @@
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.test import override_settings
+
+from core.sqlite import call_with_lock_retries
+from posts.benchmarks import (percentile, seed_owners, seed_posts,
+                              temporary_database)
+from posts.models import Post
+
+# Значения SQLite и Django по умолчанию: журнал отката, полная
+# синхронизация и пятисекундное ожидание блокировки из модуля sqlite3.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'mmap_size': 0,
+    'cache_size': -2000,
+    'busy_timeout': 5000,
+}
+
+
+class Worker(threading.Thread):
+    """Поток, который до дедлайна читает ленты и публикует посты."""
+
+    def __init__(self, seed, deadline, write_share, author_ids, group_ids,
+                 retries):
+        super().__init__()
+        self.rnd = random.Random(seed)
+        self.deadline = deadline
+        self.write_share = write_share
+        self.author_ids = author_ids
+        self.group_ids = group_ids
+        self.retries = retries
+        self.timings = {'read': [], 'write': []}
+        self.errors = 0
+
+    def run(self):
+        try:
+            while time.perf_counter() < self.deadline:
+                kind = ('write' if self.rnd.random() < self.write_share
+                        else 'read')
+                started = time.perf_counter()
+                try:
+                    getattr(self, kind)()
+                except OperationalError:
+                    self.errors += 1
+                    continue
+                self.timings[kind].append(
+                    (time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+
+    def read(self):
+        group_id = self.rnd.choice(self.group_ids)
+        posts = Post.objects.select_related('author', 'group')
+        list(posts[:settings.POSTS_NUM])
+        list(posts.filter(group_id=group_id)[:settings.POSTS_NUM])
+
+    def write(self):
+        if self.retries:
+            call_with_lock_retries(self.publish)
+        else:
+            with transaction.atomic():
+                self.publish()
+
+    def publish(self):
+        # Как в post_edit: транзакция начинается с чтения.
+        author_id = self.rnd.choice(self.author_ids)
+        Post.objects.filter(author_id=author_id).exists()
+        Post.objects.create(author_id=author_id, text='Пост под нагрузкой',
+                            group_id=self.rnd.choice(self.group_ids))
+
+
+class Command(BaseCommand):
+    help = ('Замеряет смешанную нагрузку чтения и записи из нескольких '
+            'потоков на файле SQLite с настройками по умолчанию '
+            'и с SQLITE_PRAGMAS и повтором при блокировке.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Число параллельных потоков.')
+        parser.add_argument('--seconds', type=float, default=5.0,
+                            help='Длительность каждого замера.')
+        parser.add_argument('--write-share', type=float, default=0.2,
+                            help='Доля записей среди операций.')
+        parser.add_argument('--posts', type=int, default=10_000,
+                            help='Постов в базе перед замером.')
+
+    def handle(self, *args, **options):
+        handle, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        with temporary_database(path):
+            author_ids, group_ids = seed_owners()
+            seed_posts(options['posts'], author_ids, group_ids)
+            self.stdout.write(
+                'режим         чтений/с  записей/с  ошибок'
+                '  чтение p95, мс  запись p95, мс')
+            modes = (
+                ('default', DEFAULT_PRAGMAS, False),
+                ('tuned', settings.SQLITE_PRAGMAS, True),
+            )
+            for name, pragmas, retries in modes:
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    # Новые PRAGMA получит только новое соединение.
+                    connection.close()
+                    connection.ensure_connection()
+                    self.report(name, self.run_mode(
+                        options, author_ids, group_ids, retries))
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def run_mode(self, options, author_ids, group_ids, retries):
+        deadline = time.perf_counter() + options['seconds']
+        workers = [
+            Worker(seed, deadline, options['write_share'], author_ids,
+                   group_ids, retries)
+            for seed in range(options['threads'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return workers, options['seconds']
+
+    def report(self, name, result):
+        workers, seconds = result
+        timings = {
+            kind: [value for worker in workers
+                   for value in worker.timings[kind]]
+            for kind in ('read', 'write')
+        }
+        self.stdout.write(
+            '{:<12}{:>10.1f}{:>11.1f}{:>8}{:>16.2f}{:>16.2f}'.format(
+                name,
+                len(timings['read']) / seconds,
+                len(timings['write']) / seconds,
+                sum(worker.errors for worker in workers),
+                percentile(timings['read'], 0.95) if timings['read'] else 0,
+                percentile(timings['write'], 0.95)
+                if timings['write'] else 0,
+            ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+
+from posts.benchmarks import measure, summarize
+from posts.paginator import CountedPaginator
+
+DEFAULT_PAGES = (10, 1_000, 10_000, 1_000_000)
+PER_PAGE = 10
+
+
+class Command(BaseCommand):
+    help = ('Замеряет отрисовку навигации по страницам при разном '
+            'числе страниц; база не нужна.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+',
+                            default=DEFAULT_PAGES,
+                            help='Число страниц в ленте для каждого замера.')
+        parser.add_argument('--repeat', type=int, default=200,
+                            help='Отрисовок на каждый замер.')
+
+    def handle(self, *args, **options):
+        template = get_template('posts/includes/paginator.html')
+        self.stdout.write('страниц     p50, мс   p95, мс   p99, мс    ссылок'
+                          '    байт')
+        for pages in options['pages']:
+            # Число постов задаётся снаружи, сами посты не нужны.
+            paginator = CountedPaginator(
+                [], PER_PAGE, lambda: (pages * PER_PAGE, True))
+            page = paginator.get_page(pages // 2)
+            html = template.render({'page_obj': page})
+            stats = summarize(measure(
+                lambda: template.render({'page_obj': page}),
+                options['repeat'],
+            ))
+            self.stdout.write(
+                '{:<12}{p50:>9.3f}{p95:>10.3f}{p99:>10.3f}{:>10}{:>8}'
+                .format(pages, html.count('<li'), len(html), **stats))
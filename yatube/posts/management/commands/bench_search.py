@@ -0,0 +1,55 @@
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.benchmarks import (measure, seed_owners, seed_posts, summarize,
+                              temporary_database)
+from posts.models import Post
+from posts.search import search_posts
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск по FTS5-индексу с icontains '
+            'на временной базе с заданным числом постов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000,
+                            help='Сколько постов создать.')
+        parser.add_argument('--queries', type=int, default=20,
+                            help='Сколько разных слов искать.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Повторов каждого запроса.')
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            self.stdout.write(f'Создаю {options["posts"]} постов...')
+            seed_posts(options['posts'], *seed_owners())
+            words = self.sample_words(options['queries'])
+            fts = self.run(words, options['repeat'], self.fts_page)
+            like = self.run(words, options['repeat'], self.icontains_page)
+        self.stdout.write('метод       p50, мс   p95, мс   p99, мс')
+        for name, stats in (('fts5', fts), ('icontains', like)):
+            self.stdout.write('{:<10}{p50:>9.2f}{p95:>10.2f}{p99:>10.2f}'
+                              .format(name, **stats))
+
+    def sample_words(self, count):
+        texts = Post.objects.order_by('?').values_list(
+            'text', flat=True)[:count]
+        return [random.choice(text.split()).strip('.,') for text in texts]
+
+    def run(self, words, repeat, page):
+        timings = []
+        for word in words:
+            timings.extend(measure(lambda: page(word), repeat))
+        return summarize(timings)
+
+    def fts_page(self, word):
+        results = search_posts(word)
+        results.count()
+        list(results[:settings.POSTS_NUM])
+
+    def icontains_page(self, word):
+        results = Post.objects.filter(text__icontains=word)
+        results.count()
+        list(results[:settings.POSTS_NUM])
@@ -0,0 +1,130 @@
+import json
+import platform
+import subprocess
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.benchmarks import (measure, seed_owners, seed_posts, summarize,
+                              temporary_database)
+from posts.models import Group, Post, User
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+class Command(BaseCommand):
+    help = ('Замеряет index, group_posts, profile и post_detail '
+            'на базах заданных размеров.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+',
+                            default=DEFAULT_SIZES,
+                            help='Число постов в базе для каждого замера.')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Запросов к каждой странице.')
+        parser.add_argument('--cached', action='store_true',
+                            help='Не сбрасывать кэш перед запросами.')
+        parser.add_argument('--output', help='Записать результаты в JSON.')
+        parser.add_argument('--compare',
+                            help='JSON прошлого прогона для сравнения.')
+
+    def handle(self, *args, **options):
+        results = {
+            'commit': self.current_commit(),
+            'python': platform.python_version(),
+            'posts_per_page': settings.POSTS_NUM,
+            'pagination_mode': settings.PAGINATION_MODE,
+            'cached': options['cached'],
+            'sizes': {},
+        }
+        with temporary_database():
+            author_ids, group_ids = seed_owners()
+            seeded = 0
+            for size in sorted(options['sizes']):
+                self.stdout.write(f'Наполняю базу до {size} постов...')
+                seed_posts(size - seeded, author_ids, group_ids, seed=size)
+                seeded = size
+                results['sizes'][str(size)] = self.run_size(
+                    options['requests'], options['cached'])
+        self.report(results)
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                self.compare(json.load(baseline), results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, ensure_ascii=False)
+
+    def current_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def targets(self):
+        """Адреса замеряемых страниц на текущих данных."""
+        group = Group.objects.order_by('-posts_count').first()
+        author = User.objects.order_by('-stats__posts_count').first()
+        post = Post.objects.order_by('pk')[Post.objects.count() // 2]
+        last_page = Post.objects.count() // settings.POSTS_NUM
+        return {
+            'index': reverse('posts:index'),
+            'index_deep': reverse('posts:index') + f'?page={last_page}',
+            'group_posts': reverse('posts:group_list',
+                                   kwargs={'slug': group.slug}),
+            'profile': reverse('posts:profile',
+                               kwargs={'username': author.username}),
+            'post_detail': reverse('posts:post_detail',
+                                   kwargs={'post_id': post.pk}),
+        }
+
+    def run_size(self, requests, cached):
+        client = Client()
+        views = {}
+        for name, url in self.targets().items():
+            def request():
+                if not cached:
+                    cache.clear()
+                client.get(url)
+
+            request()
+            # Журнал запросов ограничен 9000 записями и заполнен сидингом.
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                request()
+            stats = summarize(measure(request, requests))
+            stats['queries'] = len(queries.captured_queries)
+            views[name] = stats
+        return views
+
+    def report(self, results):
+        self.stdout.write(f'коммит {results["commit"]}')
+        self.stdout.write('постов      страница      p50, мс   p95, мс   '
+                          'p99, мс  запросов')
+        for size, views in results['sizes'].items():
+            for name, stats in views.items():
+                self.stdout.write(
+                    '{:<12}{:<12}{p50:>9.2f}{p95:>10.2f}{p99:>10.2f}'
+                    '{queries:>10}'.format(size, name, **stats))
+
+    def compare(self, baseline, results):
+        self.stdout.write(f'сравнение с {baseline.get("commit")} (p95):')
+        for size, views in results['sizes'].items():
+            for name, stats in views.items():
+                old = baseline['sizes'].get(size, {}).get(name)
+                if not old:
+                    continue
+                change = (stats['p95'] - old['p95']) / old['p95']
+                line = (f'{size:<12}{name:<12}{old["p95"]:>9.2f} -> '
+                        f'{stats["p95"]:.2f} ({change:+.0%}), запросов '
+                        f'{old["queries"]} -> {stats["queries"]}')
+                if change > 0.2 or stats['queries'] > old['queries']:
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
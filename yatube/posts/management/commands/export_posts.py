@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import FORMATTERS, export_lines
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты автора в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Имя пользователя автора.')
+        parser.add_argument('--format', choices=sorted(FORMATTERS),
+                            default='ndjson', dest='export_format')
+        parser.add_argument('--output', help='Файл; по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int,
+                            help='Постов в одном запросе к базе.')
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден')
+        lines = export_lines(author, options['export_format'],
+                             options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
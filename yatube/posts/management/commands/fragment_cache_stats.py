@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.caching import fragment_stats, reset_fragment_stats
+from posts.checks import cache_backend, is_process_local_cache
+
+
+class Command(BaseCommand):
+    help = ('Показывает попадания и промахи кэша карточек постов, '
+            'накопленные всеми процессами в общем кэше. Процессы '
+            'сливают счётчики пачками, поэтому доля приблизительна.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Обнулить счётчики после вывода.')
+
+    def handle(self, *args, **options):
+        # Кэш в памяти процесса команды пуст: счётчики сервера живут
+        # в памяти его процессов.
+        if is_process_local_cache():
+            raise CommandError(
+                f'Счётчики недоступны: кэш {cache_backend()} виден '
+                f'только своему процессу.')
+        hits, misses, ratio = fragment_stats()
+        self.stdout.write(
+            f'Попаданий: {hits}, промахов: {misses}, доля: {ratio:.1%}'
+        )
+        if options['reset']:
+            reset_fragment_stats()
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from posts.importing import PostImporter
+
+
+class Command(BaseCommand):
+    help = ('Импортирует посты из NDJSON-файла порциями bulk_create '
+            'с продолжением с контрольной точки после сбоя.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON-файл с постами.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Постов в одной транзакции.')
+        parser.add_argument('--checkpoint',
+                            help='Файл контрольной точки; по умолчанию '
+                                 '<path>.checkpoint.')
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Создавать неизвестных авторов и группы.')
+
+    def handle(self, *args, **options):
+        importer = PostImporter(
+            batch_size=options['batch_size'],
+            create_missing=options['create_missing'],
+            checkpoint=(options['checkpoint']
+                        or f'{options["path"]}.checkpoint'),
+            on_error=self.report_error,
+            on_batch=self.report_progress,
+        )
+        stats = importer.run(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано постов: {stats.imported}, '
+            f'отклонено строк: {stats.rejected}, '
+            f'{stats.rate:.0f} строк/с.'
+        ))
+
+    def report_error(self, line_no, message):
+        self.stderr.write(f'строка {line_no}: {message}')
+
+    def report_progress(self, stats):
+        self.stdout.write(
+            f'  {stats.imported} постов, {stats.rate:.0f} строк/с')
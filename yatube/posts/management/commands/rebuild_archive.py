@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает дни архива постов по таблице постов.'
+
+    def handle(self, *args, **options):
+        days = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Дней в архиве: {days}.'))
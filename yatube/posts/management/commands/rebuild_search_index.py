@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.search import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default',
+                            help='Алиас базы данных.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен за {time.perf_counter() - started:.2f} с.'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Сверяет счётчики постов авторов и групп с таблицей постов.'
+
+    def handle(self, *args, **options):
+        fixed_authors, fixed_groups = recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков: авторов — {fixed_authors}, '
+            f'групп — {fixed_groups}.'
+        ))
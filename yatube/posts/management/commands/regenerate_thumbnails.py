@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.receivers import expire_post_pages
+from posts.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = ('Нарезает недостающие миниатюры картинок постов, например '
+            'после перезапуска процесса с очередью нарезки.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').values_list(
+            'pk', 'author_id', 'group_id', 'image').order_by('pk')
+        generated = sum(
+            generate_thumbnails(image, on_done=expire_post_pages(
+                pk, author_id, group_id))
+            for pk, author_id, group_id, image in posts.iterator()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Нарезаны миниатюры постов: {generated}.'))
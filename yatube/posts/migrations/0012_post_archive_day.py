@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:22
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_archive(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostArchiveDay = apps.get_model('posts', 'PostArchiveDay')
+    days = Counter()
+    for author_id, group_id, day, total in (
+            Post.objects.order_by().annotate(day=TruncDate('pub_date'))
+            .values_list('author_id', 'group_id', 'day')
+            .annotate(total=Count('pk'))):
+        days['all', day] += total
+        days[f'author:{author_id}', day] += total
+        if group_id is not None:
+            days[f'group:{group_id}', day] += total
+    PostArchiveDay.objects.bulk_create(
+        PostArchiveDay(scope=scope, day=day, posts_count=total)
+        for (scope, day), total in days.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostArchiveDay',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32, verbose_name='Область')),
+                ('day', models.DateField(verbose_name='День')),
+                ('posts_count', models.PositiveIntegerField(default=0, help_text='Поддерживается автоматически при записи постов', verbose_name='Число постов')),
+            ],
+            options={
+                'verbose_name': 'День архива',
+                'verbose_name_plural': 'Дни архива',
+                'unique_together': {('scope', 'day')},
+            },
+        ),
+        migrations.RunPython(fill_archive, migrations.RunPython.noop),
+    ]
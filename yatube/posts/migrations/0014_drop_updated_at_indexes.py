@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_updated_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_group_updated_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_author_updated_at_idx',
+        ),
+    ]
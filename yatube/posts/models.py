@@ -1,9 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .signals import (posts_bulk_changed, posts_bulk_changing,
+                      posts_bulk_created)
 
 
 User = get_user_model()
 
+# Длина отрывка поста, который выводят ленты вместо полного текста.
+EXCERPT_LENGTH = 15
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200,
@@ -18,11 +25,103 @@ class Group(models.Model):
     description = models.TextField(verbose_name='Описание группы',
                                    help_text='Подробное описание группы'
                                    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число постов',
+        help_text='Поддерживается автоматически при записи постов'
+    )
 
     def __str__(self):
         return self.title
 
 
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число постов',
+        help_text='Поддерживается автоматически при записи постов'
+    )
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+
+class PostQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, keep_pub_date=False, **kwargs):
+        """Массовая вставка, о которой узнают счётчики и кэши.
+
+        keep_pub_date=True сохраняет заданные pub_date (импорт): строки
+        вставляются в обход Field.pre_save, и auto_now_add не подменяет
+        даты; постам без даты и updated_at ставится текущее время.
+        """
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.fill_excerpt()
+            if keep_pub_date:
+                obj.pub_date = obj.pub_date or now
+                obj.updated_at = obj.updated_at or now
+        self._raw_insert = keep_pub_date
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            posts_bulk_created.send(sender=self.model, posts=objs,
+                                    using=self.db)
+        return objs
+
+    def _insert(self, objs, fields, **kwargs):
+        # Флаг живёт на этом экземпляре выборки, а не на общем поле
+        # модели, поэтому параллельные вставки его не видят.
+        if getattr(self, '_raw_insert', False):
+            kwargs['raw'] = True
+        return super()._insert(objs, fields, **kwargs)
+
+    def set_group(self, group):
+        """Переносит выборку в группу (None — убирает из групп).
+
+        Один UPDATE без загрузки постов; post_save не отправляется,
+        счётчики и кэши обновляют posts_bulk_changing и posts_bulk_changed.
+        Возвращает число перенесённых постов.
+        """
+        if group is None:
+            posts = self.filter(group__isnull=False)
+        else:
+            posts = self.exclude(group=group)
+        with transaction.atomic(using=self.db, savepoint=False):
+            posts_bulk_changing.send(sender=self.model, posts=posts,
+                                     group=group, deleted=False,
+                                     using=self.db)
+            # update() не трогает auto_now.
+            changed = posts.update(group=group, updated_at=timezone.now())
+            posts_bulk_changed.send(sender=self.model, changed=changed,
+                                    deleted=False, using=self.db)
+        return changed
+
+    def delete_at_once(self):
+        """Удаляет выборку одним DELETE без загрузки постов и post_delete.
+
+        Возвращает число удалённых постов.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            posts_bulk_changing.send(sender=self.model, posts=self,
+                                     group=None, deleted=True, using=self.db)
+            deleted = self._raw_delete(self.db)
+            posts_bulk_changed.send(sender=self.model, changed=deleted,
+                                    deleted=True, using=self.db)
+        return deleted
+
+
 class Post(models.Model):
     text = models.TextField(verbose_name='Текст поста',
                             help_text='Текст нового поста')
@@ -30,10 +129,15 @@ class Post(models.Model):
                                     verbose_name='Дата публикации',
                                     help_text='Дата публикации поста'
                                     )
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name='Дата изменения',
+                                      help_text='Дата последней правки поста'
+                                      )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='posts',
+        db_index=False,
         verbose_name='Автор',
         help_text='Автор поста'
     )
@@ -43,14 +147,81 @@ class Post(models.Model):
         null=True,
         on_delete=models.SET_NULL,
         related_name='posts',
+        db_index=False,
         verbose_name='Группа',
         help_text='Группа, к которой относится пост'
     )
 
+    image = models.ImageField(
+        upload_to='posts/',
+        blank=True,
+        verbose_name='Картинка',
+        help_text='Картинка к посту'
+    )
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Отрывок',
+        help_text='Начало текста для лент, обновляется при сохранении'
+    )
+
+    objects = PostQuerySet.as_manager()
+
     def __str__(self):
-        return self.text[:15]
+        # Ленты грузят посты без text: отрывок не требует запроса.
+        if 'text' in self.get_deferred_fields():
+            return self.excerpt
+        return self.text[:EXCERPT_LENGTH]
+
+    def fill_excerpt(self):
+        self.excerpt = self.text[:EXCERPT_LENGTH]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.fill_excerpt()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
 
     class Meta:
         ordering = ['-pub_date']
+        # Составные индексы покрывают фильтр и сортировку лент, поэтому
+        # отдельные индексы по author_id и group_id не нужны.
+        indexes = [
+            models.Index(fields=['pub_date', 'id'],
+                         name='post_pub_date_id_idx'),
+            models.Index(fields=['group', 'pub_date'],
+                         name='post_group_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='post_author_pub_date_idx'),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+
+
+class PostArchiveDay(models.Model):
+    """Число постов за день в области архива.
+
+    Область — 'all' для всего сайта, 'author:<id>' или 'group:<id>'.
+    Навигация архива суммирует эти строки вместо подсчёта постов.
+    """
+
+    scope = models.CharField(max_length=32, verbose_name='Область')
+    day = models.DateField(verbose_name='День')
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число постов',
+        help_text='Поддерживается автоматически при записи постов'
+    )
+
+    def __str__(self):
+        return f'{self.scope} {self.day}: {self.posts_count}'
+
+    class Meta:
+        # Уникальный индекс (scope, day) отвечает и за выборку
+        # диапазона дней области.
+        unique_together = ('scope', 'day')
+        verbose_name = 'День архива'
+        verbose_name_plural = 'Дни архива'
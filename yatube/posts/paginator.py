@@ -1,7 +1,245 @@
-from django.core.paginator import Paginator
+import base64
+import binascii
+import json
 
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 
-def pagination(request, post_list, posts_per_page):
-    paginator = Paginator(post_list, posts_per_page)
+FORWARD = 'after'
+BACKWARD = 'before'
+
+
+def encode_cursor(direction, post):
+    """Упаковывает позицию поста в непрозрачный токен для URL."""
+    raw = json.dumps([direction, post.pub_date.isoformat(), post.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковывает токен; для повреждённого токена возвращает None."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, pub_date, pk = json.loads(
+            base64.urlsafe_b64decode(padded.encode()).decode()
+        )
+        pub_date = parse_datetime(pub_date)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if (
+        direction not in (FORWARD, BACKWARD)
+        or pub_date is None
+        or not isinstance(pk, int)
+    ):
+        return None
+    return direction, pub_date, pk
+
+
+class KeysetPage:
+    """Страница курсорной пагинации с интерфейсом, близким к Page."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return encode_cursor(FORWARD, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return encode_cursor(BACKWARD, self.object_list[0])
+
+
+class KeysetPaginator:
+    """Пагинация по ключу (pub_date, id) без COUNT(*) и OFFSET.
+
+    Стоимость любой страницы — один запрос с LIMIT per_page + 1,
+    который идёт по индексу независимо от глубины страницы.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def get_page(self, cursor):
+        """Страница по курсору.
+
+        Повреждённый курсор и курсор, за которым постов уже нет
+        (например, после удаления), дают первую страницу.
+        """
+        position = decode_cursor(cursor)
+        if position is None:
+            return self._first_page()
+        direction, pub_date, pk = position
+        if direction == FORWARD:
+            page = self._page_after(pub_date, pk)
+        else:
+            page = self._page_before(pub_date, pk)
+        return page if page.object_list else self._first_page()
+
+    def _slice(self, queryset):
+        return list(queryset[:self.per_page + 1])
+
+    def _first_page(self):
+        rows = self._slice(self.object_list.order_by('-pub_date', '-pk'))
+        return KeysetPage(rows[:self.per_page],
+                          has_next=len(rows) > self.per_page,
+                          has_previous=False)
+
+    def _page_after(self, pub_date, pk):
+        rows = self._slice(
+            self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            ).order_by('-pub_date', '-pk')
+        )
+        # Назад ведёт курсор первой строки, поэтому ссылка есть,
+        # только если строки есть.
+        return KeysetPage(rows[:self.per_page],
+                          has_next=len(rows) > self.per_page,
+                          has_previous=bool(rows))
+
+    def _page_before(self, pub_date, pk):
+        rows = self._slice(
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk')
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, has_next=bool(rows),
+                          has_previous=has_previous)
+
+
+class WindowedPage(Page):
+    @property
+    def page_window(self):
+        """Номера страниц для навигации с многоточиями вместо пропусков."""
+        return list(self.paginator.get_elided_page_range(self.number))
+
+
+class WindowedPaginator(Paginator):
+    """Paginator с окном номеров вокруг текущей страницы.
+
+    get_elided_page_range повторяет одноимённый метод Django 3.2:
+    первые и последние on_ends страниц, on_each_side страниц по обе
+    стороны от текущей и ELLIPSIS на месте пропусков. Размер окна
+    не зависит от числа страниц.
+    """
+
+    ELLIPSIS = '…'
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > (1 + on_each_side + on_ends) + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < (self.num_pages - on_each_side - on_ends) - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1,
+                             self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class CountedPaginator(WindowedPaginator):
+    """Paginator, который берёт число объектов у count, а не из COUNT(*).
+
+    count возвращает пару (число, точное ли оно). Оценка должна быть
+    не меньше настоящего числа: неполная страница уточняет его даром,
+    а за пустую страницу в хвосте COUNT(*) выполняется один раз,
+    и показывается последняя непустая. Уточнённое число передаётся
+    в remember.
+    """
+
+    def __init__(self, object_list, per_page, count, remember=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_provider = count
+        self.remember = remember or (lambda count: None)
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        count, self.count_is_exact = self.count_provider()
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        if self.count_is_exact or len(page) == self.per_page:
+            return page
+        if len(page) or page.number == 1:
+            self.set_exact_count(
+                (page.number - 1) * self.per_page + len(page))
+            return page
+        self.set_exact_count(self.object_list.count())
+        return super().page(min(page.number, self.num_pages))
+
+    def set_exact_count(self, count):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.count_is_exact = True
+        self.remember(count)
+
+
+def pagination(request, post_list, posts_per_page, mode=None, count=None,
+               remember_count=None):
+    """Возвращает страницу постов в режиме settings.PAGINATION_MODE.
+
+    В режиме 'offset' — обычная страница Paginator по ?page=,
+    в режиме 'keyset' — курсорная страница по ?cursor=. count —
+    необязательный источник числа постов для CountedPaginator.
+    """
+    if (mode or settings.PAGINATION_MODE) == 'keyset':
+        paginator = KeysetPaginator(post_list, posts_per_page)
+        return paginator.get_page(request.GET.get('cursor'))
+    if count is not None:
+        paginator = CountedPaginator(post_list, posts_per_page, count,
+                                     remember=remember_count)
+    else:
+        paginator = WindowedPaginator(post_list, posts_per_page)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
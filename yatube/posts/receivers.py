@@ -0,0 +1,235 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import archive, caching, counters, counting, thumbnails
+from .models import Group, Post, PostArchiveDay, User
+from .signals import (posts_bulk_changed, posts_bulk_changing,
+                      posts_bulk_created)
+
+
+@receiver(pre_save, sender=Post)
+def remember_saved_owner(sender, instance, raw, **kwargs):
+    """Запоминает автора и группу поста до изменения."""
+    instance._saved_owner = None
+    if raw or instance._state.adding:
+        return
+    instance._saved_owner = Post.objects.filter(pk=instance.pk).values_list(
+        'author_id', 'group_id').first()
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.apply_deltas(*counters.count_posts([instance]))
+        return
+    saved_owner = getattr(instance, '_saved_owner', None)
+    if saved_owner is None:
+        return
+    author_deltas, group_deltas = Counter(), Counter()
+    saved_author_id, saved_group_id = saved_owner
+    if saved_author_id != instance.author_id:
+        author_deltas[saved_author_id] -= 1
+        author_deltas[instance.author_id] += 1
+    if saved_group_id != instance.group_id:
+        group_deltas[saved_group_id] -= 1
+        group_deltas[instance.group_id] += 1
+    counters.apply_deltas(author_deltas, group_deltas)
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance, **kwargs):
+    counters.apply_deltas(*counters.count_posts([instance], sign=-1))
+
+
+@receiver(posts_bulk_created, sender=Post)
+def update_counters_on_bulk_create(sender, posts, **kwargs):
+    counters.apply_deltas(*counters.count_posts(posts))
+
+
+@receiver(posts_bulk_changing, sender=Post)
+def update_counters_on_bulk_change(sender, posts, group, deleted, **kwargs):
+    # Перенос между группами не меняет счётчики авторов.
+    counters.remove_posts(posts, authors=deleted)
+    if group is not None:
+        counters.change_group_posts(group.pk, posts.count())
+
+
+@receiver(post_save, sender=Post)
+def update_archive_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        archive.apply_deltas(archive.count_posts([instance]))
+        return
+    saved_owner = getattr(instance, '_saved_owner', None)
+    if saved_owner is None or saved_owner == (instance.author_id,
+                                              instance.group_id):
+        return
+    day = archive.publication_day(instance)
+    deltas = archive.count_days([(*saved_owner, day, 1)], sign=-1)
+    deltas.update(archive.count_days(
+        [(instance.author_id, instance.group_id, day, 1)]))
+    archive.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_delete(sender, instance, **kwargs):
+    archive.apply_deltas(archive.count_posts([instance], sign=-1))
+
+
+@receiver(posts_bulk_created, sender=Post)
+def update_archive_on_bulk_create(sender, posts, **kwargs):
+    archive.apply_deltas(archive.count_posts(posts))
+
+
+@receiver(posts_bulk_changing, sender=Post)
+def update_archive_on_bulk_change(sender, posts, group, deleted, **kwargs):
+    archive.remove_posts(posts, authors=deleted)
+    if group is not None:
+        archive.add_to_group(posts, group.pk)
+
+
+@receiver(post_delete, sender=Group)
+def drop_group_archive(sender, instance, **kwargs):
+    # Посты группы остаются без неё через UPDATE без сигналов.
+    PostArchiveDay.objects.filter(
+        scope=archive.group_scope(instance.pk)).delete()
+
+
+@receiver(post_delete, sender=User)
+def drop_author_archive(sender, instance, **kwargs):
+    PostArchiveDay.objects.filter(
+        scope=archive.author_scope(instance.pk)).delete()
+
+
+@receiver(post_save, sender=Post)
+def expire_posts_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        counting.expire_all_posts_count()
+
+
+@receiver(post_delete, sender=Post)
+def expire_posts_count_on_delete(sender, instance, **kwargs):
+    counting.expire_all_posts_count()
+
+
+@receiver(posts_bulk_created, sender=Post)
+def expire_posts_count_on_bulk_create(sender, posts, **kwargs):
+    if posts:
+        counting.expire_all_posts_count()
+
+
+@receiver(posts_bulk_changed, sender=Post)
+def expire_posts_count_on_bulk_change(sender, changed, deleted, **kwargs):
+    if changed and deleted:
+        counting.expire_all_posts_count()
+
+
+@receiver(post_save, sender=Post)
+def expire_post_fragment(sender, instance, created, **kwargs):
+    if not created:
+        caching.bump_generations(f'post:{instance.pk}')
+
+
+@receiver(post_save, sender=Group)
+def expire_group_caches(sender, instance, created, **kwargs):
+    caching.bump_generations(f'group:{instance.pk}')
+    if created:
+        # Снимает отрицательную запись поиска группы по этому slug.
+        caching.bump_generations(caching.group_page_scope(instance.slug))
+    else:
+        caching.bump_generations(caching.ALL_PAGES_SCOPE)
+
+
+@receiver(post_save, sender=User)
+def expire_author_caches(sender, instance, created, update_fields,
+                         **kwargs):
+    # Вход пользователя обновляет только last_login — карточки не меняются.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    caching.bump_generations(f'author:{instance.pk}')
+    if created:
+        caching.bump_generations(
+            caching.author_page_scope(instance.username))
+    else:
+        caching.bump_generations(caching.ALL_PAGES_SCOPE)
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=User)
+def expire_caches_on_owner_delete(sender, instance, **kwargs):
+    caching.bump_generations(caching.ALL_PAGES_SCOPE)
+
+
+def expire_pages(author_ids, group_ids):
+    """Сдвигает поколения главной и лент затронутых авторов и групп."""
+    scopes = [caching.INDEX_PAGE_SCOPE]
+    scopes.extend(map(caching.author_page_scope, User.objects.filter(
+        pk__in=author_ids).values_list('username', flat=True)))
+    group_ids = [group_id for group_id in group_ids if group_id is not None]
+    if group_ids:
+        scopes.extend(map(caching.group_page_scope, Group.objects.filter(
+            pk__in=group_ids).values_list('slug', flat=True)))
+    caching.bump_generations(*scopes)
+
+
+@receiver(post_save, sender=Post)
+def expire_pages_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    author_ids, group_ids = {instance.author_id}, {instance.group_id}
+    saved_owner = getattr(instance, '_saved_owner', None)
+    if saved_owner is not None:
+        author_ids.add(saved_owner[0])
+        group_ids.add(saved_owner[1])
+    expire_pages(author_ids, group_ids)
+
+
+@receiver(post_delete, sender=Post)
+def expire_pages_on_delete(sender, instance, **kwargs):
+    expire_pages({instance.author_id}, {instance.group_id})
+
+
+@receiver(posts_bulk_created, sender=Post)
+def expire_pages_on_bulk_create(sender, posts, **kwargs):
+    if not posts:
+        return
+    expire_pages({post.author_id for post in posts},
+                 {post.group_id for post in posts})
+
+
+@receiver(posts_bulk_changed, sender=Post)
+def expire_pages_on_bulk_change(sender, changed, **kwargs):
+    # Затронуты и страницы самих постов; сдвигать post:{pk} для каждого
+    # значит загрузить выборку, поэтому устаревают все страницы сразу.
+    # Карточки постов в ключе содержат group_id и остаются верными.
+    if changed:
+        caching.bump_generations(caching.ALL_PAGES_SCOPE)
+
+
+@receiver(post_save, sender=Post)
+def generate_post_thumbnails(sender, instance, raw, **kwargs):
+    """После коммита отдаёт картинку поста в пул нарезки миниатюр.
+
+    Когда миниатюры готовы, карточка и ленты поста перерисовываются.
+    """
+    if raw or not instance.image:
+        return
+    image = instance.image.name
+    expire_post = expire_post_pages(
+        instance.pk, instance.author_id, instance.group_id)
+    transaction.on_commit(
+        lambda: thumbnails.schedule_thumbnails(image, on_done=expire_post))
+
+
+def expire_post_pages(post_id, author_id, group_id):
+    """Колбэк, сбрасывающий карточку поста и ленты, где он виден."""
+    def expire_post():
+        caching.bump_generations(f'post:{post_id}')
+        expire_pages({author_id}, {group_id})
+    return expire_post
@@ -0,0 +1,161 @@
+import re
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+POSTS_TABLE = Post._meta.db_table
+
+# Внешний FTS5-индекс над posts_post.text: сам текст хранится только
+# в posts_post, триггеры поддерживают индекс при вставке, правке и
+# удалении строк.
+INSTALL_SQL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text,
+        content='{POSTS_TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+        AFTER INSERT ON {POSTS_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+        AFTER DELETE ON {POSTS_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF text ON {POSTS_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+            VALUES ('delete', old.id, old.text);
+            INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+)
+UNINSTALL_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+MATCH_SQL = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+
+WORD_RE = re.compile(r'\w+')
+
+
+def is_supported(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def install(using='default'):
+    """Создаёт индекс и триггеры, если их ещё нет.
+
+    Пересоздание posts_post в миграциях SQLite удаляет триггеры,
+    поэтому вызывается и после каждого migrate.
+    """
+    db = connections[using]
+    if (not is_supported(using)
+            or POSTS_TABLE not in db.introspection.table_names()):
+        return
+    with db.cursor() as cursor:
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+
+
+def uninstall(using='default'):
+    if not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        for statement in UNINSTALL_SQL:
+            cursor.execute(statement)
+
+
+def rebuild(using='default'):
+    """Заново строит индекс по содержимому posts_post."""
+    install(using)
+    if not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_query(text):
+    """Превращает ввод пользователя в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки, последнее ищется по префиксу,
+    поэтому операторы FTS5 во вводе не вызывают синтаксических ошибок.
+    """
+    words = WORD_RE.findall(text)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class SearchResults:
+    """Ленивая выдача поиска по релевантности для Paginator.
+
+    Индекс и посты читаются из одной базы, выбранной роутером: с
+    реплики, если запрос читает с реплик.
+    """
+
+    def __init__(self, match_query, queryset):
+        self.match_query = match_query
+        self.using = router.db_for_read(Post)
+        self.queryset = queryset.using(self.using)
+
+    def count(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                [self.match_query],
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        limit = -1 if index.stop is None else index.stop - start
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                MATCH_SQL + ' ORDER BY rank LIMIT %s OFFSET %s',
+                [self.match_query, limit, start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(text, queryset=None):
+    """Возвращает найденные посты в порядке релевантности.
+
+    Без FTS5 (не SQLite) выполняет обычный поиск по подстроке.
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    if not is_supported():
+        return queryset.filter(text__icontains=text)
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset.none()
+    return SearchResults(match_query, queryset)
+
+
+def filter_matching(queryset, text):
+    """Оставляет в queryset посты, подходящие под поисковый запрос."""
+    if not is_supported():
+        return queryset.filter(text__icontains=text)
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(MATCH_SQL, [match_query]))
@@ -0,0 +1,14 @@
+from django.dispatch import Signal
+
+# Отправляется после PostQuerySet.bulk_create, который не шлёт post_save.
+posts_bulk_created = Signal(providing_args=['posts', 'using'])
+
+# Отправляются внутри транзакции до и после массовой правки или удаления
+# постов одним запросом (PostQuerySet.set_group, PostQuerySet.delete_at_once).
+# posts — затронутая выборка ещё до изменения, по ней получатели правят
+# агрегаты запросами над множеством; group — группа, куда переносятся посты
+# (None — посты уходят из групп); deleted — выборка удаляется; changed —
+# число затронутых постов.
+posts_bulk_changing = Signal(
+    providing_args=['posts', 'group', 'deleted', 'using'])
+posts_bulk_changed = Signal(providing_args=['changed', 'deleted', 'using'])
@@ -0,0 +1,18 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from posts.caching import render_post_fragment
+from posts.thumbnails import cached_thumbnail
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_fragment(post):
+    return mark_safe(render_post_fragment(post))
+
+
+@register.simple_tag
+def post_thumbnail(post, size):
+    """Готовая миниатюра картинки поста; пока её нет — None."""
+    return cached_thumbnail(post.image, size)
@@ -0,0 +1,216 @@
+import datetime
+
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from core.testing import run_commit_callbacks
+from posts import archive, counters, counting
+from posts.models import Group, Post, PostArchiveDay
+
+User = get_user_model()
+
+CHANGELIST_URL = reverse('admin:posts_post_changelist')
+
+
+def aware(*args):
+    return timezone.make_aware(datetime.datetime(*args))
+
+
+def archive_rows():
+    return set(PostArchiveDay.objects.filter(posts_count__gt=0).values_list(
+        'scope', 'day', 'posts_count'))
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        cls.groups = [
+            Group.objects.create(title=f'Группа {number}',
+                                 slug=f'group-{number}', description='')
+            for number in range(3)
+        ]
+        for number in range(6):
+            Post.objects.create(author=cls.admin, text=f'Пост {number}',
+                                group=cls.groups[number % 3])
+        Post.objects.filter(text__in=['Пост 0', 'Пост 1']).update(
+            pub_date=aware(2020, 5, 3))
+        Post.objects.filter(text='Пост 2').update(
+            pub_date=aware(2020, 7, 1))
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка не зависит от числа строк и групп."""
+        self.client.get(CHANGELIST_URL)
+        with self.assertNumQueries(10):
+            self.client.get(CHANGELIST_URL)
+        for number in range(3, 8):
+            group = Group.objects.create(
+                title=f'Группа {number}', slug=f'group-{number}',
+                description='')
+            Post.objects.create(author=self.admin, text='Ещё пост',
+                                group=group)
+        self.client.get(CHANGELIST_URL)
+        with self.assertNumQueries(10):
+            response = self.client.get(CHANGELIST_URL)
+        # Выпадающие списки одиннадцати строк и формы действий.
+        self.assertContains(response, 'Группа 7', count=12)
+
+    def test_no_full_result_count(self):
+        """Список не считает строки без фильтров."""
+        response = self.client.get(CHANGELIST_URL)
+        cl = response.context['cl']
+        self.assertIsNone(cl.full_result_count)
+        self.assertEqual(cl.result_count, Post.objects.count())
+
+    def test_date_hierarchy_levels(self):
+        """Навигация по датам выводит годы, месяцы и дни с постами."""
+        year = timezone.localtime().year
+        cases = (
+            ({}, [f'?pub_date__year={value}' for value in (2020, year)]),
+            ({'pub_date__year': 2020},
+             [f'?pub_date__month={month}&pub_date__year=2020'
+              for month in (5, 7)]),
+            ({'pub_date__year': 2020, 'pub_date__month': 5},
+             ['?pub_date__day=3&pub_date__month=5&pub_date__year=2020']),
+        )
+        for params, links in cases:
+            with self.subTest(params=params):
+                response = self.client.get(CHANGELIST_URL, params)
+                self.assertEqual([choice['link'] for choice in
+                                  response.context['choices']], links)
+
+    def test_filtered_count_is_limited(self):
+        """Отфильтрованный список считает не больше ADMIN_COUNT_LIMIT."""
+        with self.settings(ADMIN_COUNT_LIMIT=2):
+            response = self.client.get(
+                CHANGELIST_URL, {'pub_date__year': 2020})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def run_action(self, action, pks=(), **data):
+        with run_commit_callbacks():
+            return self.client.post(CHANGELIST_URL, {
+                'action': action,
+                '_selected_action': list(pks) or [Post.objects.first().pk],
+                'select_across': '0' if pks else '1',
+                'index': '0',
+                **data,
+            })
+
+    def test_move_across_pages(self):
+        """Перенос всех постов в группу правит счётчики и ленты."""
+        group = self.groups[0]
+        group_url = reverse('posts:group_list', kwargs={'slug': group.slug})
+        self.assertNotContains(Client().get(group_url), 'Пост 1')
+        response = self.run_action('move_to_group', group=group.pk)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Post.objects.filter(group=group).count(), 6)
+        self.assertEqual(Group.objects.get(pk=group.pk).posts_count, 6)
+        self.assertEqual(counters.recount(), (0, 0))
+        self.assertContains(Client().get(group_url), 'Пост 1')
+
+    def test_clear_group_of_selected(self):
+        """Выбранные посты уходят из групп, остальные остаются."""
+        pks = Post.objects.filter(
+            group=self.groups[1]).values_list('pk', flat=True)
+        self.run_action('clear_group', pks)
+        self.assertFalse(Post.objects.filter(group=self.groups[1]).exists())
+        self.assertEqual(Post.objects.filter(group__isnull=True).count(), 2)
+        self.assertEqual(counters.recount(), (0, 0))
+
+    def test_delete_posts(self):
+        """Удаление выборки правит счётчики и сбрасывает кэш страниц."""
+        index_url = reverse('posts:index')
+        self.assertContains(Client().get(index_url), 'Пост 5')
+        self.run_action('delete_posts', post='yes')
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(counters.recount(), (0, 0))
+        self.assertNotContains(Client().get(index_url), 'Пост 5')
+
+    def test_delete_posts_asks_confirmation(self):
+        """Удаление сначала показывает число постов и ничего не удаляет."""
+        response = self.run_action('delete_posts')
+        self.assertTemplateUsed(
+            response, 'admin/posts/post/delete_posts_confirmation.html')
+        self.assertContains(response, 'Будет удалено постов: 6.')
+        self.assertContains(
+            response, '<input type="hidden" name="select_across" value="1">',
+            html=True)
+        self.assertEqual(Post.objects.count(), 6)
+        pks = list(Post.objects.filter(
+            group=self.groups[0]).values_list('pk', flat=True))
+        response = self.run_action('delete_posts', pks)
+        self.assertContains(response, 'Будет удалено постов: 2.')
+        for pk in pks:
+            self.assertContains(
+                response, f'name="_selected_action" value="{pk}"')
+        self.assertFalse(LogEntry.objects.exists())
+
+    def test_delete_posts_logged(self):
+        """Подтверждённое удаление оставляет запись в журнале админки."""
+        pks = list(Post.objects.filter(
+            group=self.groups[0]).values_list('pk', flat=True))
+        self.run_action('delete_posts', pks, post='yes')
+        entry = LogEntry.objects.get()
+        self.assertEqual(entry.action_flag, DELETION)
+        self.assertEqual(entry.user, self.admin)
+        self.assertEqual(entry.object_repr, 'Удалено постов: 2')
+        self.assertIn(str(pks[0]), entry.change_message)
+
+    def test_actions_do_not_load_posts(self):
+        """Число запросов действия не зависит от размера выборки.
+
+        Выборка охватывает несколько авторов, групп и дней.
+        """
+        authors = [self.admin] + [
+            User.objects.create_user(username=f'author-{number}')
+            for number in range(3)
+        ]
+        posts = Post.objects.bulk_create([
+            Post(author=authors[number % 4], text='Ещё пост',
+                 group=self.groups[number % 2])
+            for number in range(12)
+        ])
+        for number, post in enumerate(posts):
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=aware(2021, 1 + number % 6, 1 + number))
+        archive.rebuild()
+        fresh = Post.objects.filter(text='Ещё пост')
+        target = self.groups[2]
+        for action, data in (('move_to_group', {'group': target.pk}),
+                             ('delete_posts', {'post': 'yes'})):
+            with self.subTest(action=action):
+                pks = list(fresh.values_list('pk', flat=True))
+                # Число постов списка кэшируется; удаление его сбрасывает.
+                # Тип содержимого для журнала кэшируется после первого раза.
+                counting.all_posts_count()
+                ContentType.objects.get_for_model(Post)
+                with CaptureQueriesContext(connection) as small:
+                    self.run_action(action, pks[:1], **data)
+                counting.all_posts_count()
+                with CaptureQueriesContext(connection) as large:
+                    self.run_action(action, pks[1:], **data)
+                self.assertEqual(len(small), len(large))
+                self.assertEqual(counters.recount(), (0, 0))
+                rows = archive_rows()
+                archive.rebuild()
+                self.assertEqual(rows, archive_rows())
+        self.assertFalse(fresh.exists())
+
+    def test_standard_delete_action_hidden(self):
+        """Стандартного удаления с загрузкой постов в списке нет."""
+        response = self.client.get(CHANGELIST_URL)
+        self.assertNotContains(response, 'delete_selected')
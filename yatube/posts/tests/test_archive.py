@@ -0,0 +1,171 @@
+import datetime
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from posts import archive
+from posts.models import Group, Post, PostArchiveDay
+
+User = get_user_model()
+
+
+def aware(*args):
+    return timezone.make_aware(datetime.datetime(*args))
+
+
+def archive_rows():
+    return set(PostArchiveDay.objects.filter(posts_count__gt=0).values_list(
+        'scope', 'day', 'posts_count'))
+
+
+class ArchiveViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        dates = {
+            'Майский пост': (aware(2020, 5, 3, 10), cls.user, cls.group),
+            'Ещё майский': (aware(2020, 5, 3, 23), cls.other, None),
+            'Поздний май': (aware(2020, 5, 20), cls.user, None),
+            'Июльский пост': (aware(2020, 7, 1), cls.other, cls.group),
+            'Прошлый год': (aware(2019, 12, 31, 23, 59), cls.user, None),
+        }
+        for text, (pub_date, author, group) in dates.items():
+            post = Post.objects.create(author=author, text=text, group=group)
+            Post.objects.filter(pk=post.pk).update(pub_date=pub_date)
+        # Даты правились update() мимо сигналов.
+        archive.rebuild()
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_year_lists_months(self):
+        """Архив года показывает месяцы с числом постов."""
+        response = self.guest_client.get(
+            reverse('posts:archive', kwargs={'year': 2020}))
+        self.assertEqual(response.context['total'], 4)
+        self.assertEqual(
+            [(date.month, count) for date, count, _ in
+             response.context['choices']],
+            [(5, 3), (7, 1)],
+        )
+        self.assertNotContains(response, 'Прошлый год')
+
+    def test_month_and_day(self):
+        """Архив месяца перечисляет дни, архив дня — посты за день."""
+        response = self.guest_client.get(reverse(
+            'posts:archive', kwargs={'year': 2020, 'month': 5}))
+        self.assertEqual(
+            [(date.day, count) for date, count, _ in
+             response.context['choices']],
+            [(3, 2), (20, 1)],
+        )
+        response = self.guest_client.get(reverse(
+            'posts:archive', kwargs={'year': 2020, 'month': 5, 'day': 3}))
+        self.assertEqual(response.context['total'], 2)
+        self.assertEqual(
+            {post.text for post in response.context['page_obj']},
+            {'Майский пост', 'Ещё майский'},
+        )
+
+    def test_owner_archives(self):
+        """Архивы группы и автора показывают только их посты."""
+        cases = (
+            (reverse('posts:group_archive', kwargs={
+                'slug': 'test-slug', 'year': 2020}),
+             {'Майский пост', 'Июльский пост'}),
+            (reverse('posts:author_archive', kwargs={
+                'username': 'auth', 'year': 2020, 'month': 5}),
+             {'Майский пост', 'Поздний май'}),
+        )
+        for url, texts in cases:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(
+                    {post.text for post in response.context['page_obj']},
+                    texts)
+                self.assertEqual(response.context['total'], len(texts))
+
+    def test_range_query_without_counting_posts(self):
+        """Посты выбираются диапазоном pub_date, счёт идёт по архиву."""
+        with CaptureQueriesContext(connection) as queries:
+            self.guest_client.get(
+                reverse('posts:archive', kwargs={'year': 2020, 'month': 5}))
+        post_queries = [query['sql'] for query in queries.captured_queries
+                        if 'FROM "posts_post"' in query['sql']]
+        self.assertEqual(len(post_queries), 1)
+        self.assertIn('"posts_post"."pub_date" >=', post_queries[0])
+        self.assertNotIn('django_datetime_extract', post_queries[0])
+
+    def test_missing_dates_not_found(self):
+        """Несуществующая дата и владелец дают 404."""
+        urls = (
+            reverse('posts:archive', kwargs={'year': 2020, 'month': 13}),
+            reverse('posts:archive', kwargs={
+                'year': 2021, 'month': 2, 'day': 30}),
+            reverse('posts:group_archive', kwargs={
+                'slug': 'nope', 'year': 2020}),
+            # Следующий период уже за пределами datetime.date.
+            reverse('posts:archive', kwargs={'year': 9999}),
+            reverse('posts:archive', kwargs={'year': 9999, 'month': 12}),
+            reverse('posts:archive', kwargs={
+                'year': 9999, 'month': 12, 'day': 31}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code,
+                                 HTTPStatus.NOT_FOUND)
+
+
+class ArchiveTableTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.groups = [
+            Group.objects.create(title=f'Группа {number}',
+                                 slug=f'group-{number}', description='')
+            for number in range(2)
+        ]
+
+    def assertArchiveConsistent(self):
+        rows = archive_rows()
+        archive.rebuild()
+        self.assertEqual(rows, archive_rows())
+
+    def test_writes_keep_archive_consistent(self):
+        """Любая запись постов держит дни архива в согласии с постами."""
+        first, second = self.groups
+        post = Post.objects.create(author=self.user, text='Пост',
+                                   group=first)
+        self.assertIn(('all', archive.publication_day(post), 1),
+                      archive_rows())
+        post.group = second
+        post.save()
+        self.assertArchiveConsistent()
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Пачка', group=first)
+            for _ in range(3)
+        ])
+        self.assertArchiveConsistent()
+        Post.objects.filter(group=first).set_group(second)
+        self.assertArchiveConsistent()
+        Post.objects.filter(pk=post.pk).delete_at_once()
+        self.assertArchiveConsistent()
+        Post.objects.first().delete()
+        self.assertArchiveConsistent()
+        second.delete()
+        self.assertArchiveConsistent()
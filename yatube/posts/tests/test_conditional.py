@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils.http import http_date
+from core.testing import run_commit_callbacks
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_unchanged_page_not_modified(self):
+        """Повторный запрос с ETag — 304 без шаблонов.
+
+        Ленты проверяются без SQL, страница поста — одним запросом.
+        """
+        for url in self.urls:
+            etag = self.authorized_client.get(url)['ETag']
+            # Ещё два запроса читают сессию и пользователя.
+            queries = 3 if url == self.urls[-1] else 2
+            with self.subTest(url=url), self.assertNumQueries(queries):
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+            self.assertEqual(response.templates, [])
+
+    def test_cached_page_not_modified_without_queries(self):
+        """Закэшированная страница отвечает 304 без SQL."""
+        for url in self.urls[:3]:
+            etag = self.guest_client.get(url)['ETag']
+            with self.subTest(url=url), self.assertNumQueries(0):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_no_stale_not_modified_by_date(self):
+        """Last-Modified не отдаётся, If-Modified-Since не даёт 304.
+
+        После удаления свежего поста и переименования группы дата
+        свежей правки не растёт.
+        """
+        newer = Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group)
+        for url in self.urls[:3]:
+            response = self.guest_client.get(url)
+            self.assertFalse(response.has_header('Last-Modified'))
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        with run_commit_callbacks():
+            newer.delete()
+            group.save()
+        for url in self.urls[:3]:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=http_date())
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotContains(response, 'Новый пост')
+
+    def test_etag_depends_on_user(self):
+        """Гость и автор получают разные ETag одной страницы."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertNotEqual(
+                    self.guest_client.get(url)['ETag'],
+                    self.authorized_client.get(url)['ETag'],
+                )
+
+    def test_edit_changes_etag(self):
+        """Правка поста делает сохранённые версии страниц устаревшими."""
+        etags = {url: self.guest_client.get(url)['ETag']
+                 for url in self.urls}
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Исправлено'
+        with run_commit_callbacks():
+            post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertContains(response, 'Исправлено')
+
+    def test_delete_changes_etag(self):
+        """Удаление свежего поста меняет ETag, хотя дата правки старше."""
+        newer = Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group)
+        etags = {url: self.guest_client.get(url)['ETag']
+                 for url in self.urls[:3]}
+        with run_commit_callbacks():
+            newer.delete()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotContains(response, 'Новый пост')
+
+    def test_missing_objects_not_found(self):
+        """Для несуществующей группы по-прежнему 404."""
+        response = self.guest_client.get(
+            reverse('posts:group_list', kwargs={'slug': 'nope'}),
+            HTTP_IF_NONE_MATCH='*',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from core.testing import run_commit_callbacks
+from posts.models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assert_counts(self, author, group, other_group):
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count, author)
+        self.assertEqual(self.group.posts_count, group)
+        self.assertEqual(self.other_group.posts_count, other_group)
+
+    def test_create_edit_delete_update_counters(self):
+        """Создание, смена группы и удаление поста меняют счётчики."""
+        self.authorized_client.post(reverse('posts:post_create'), data={
+            'text': 'Новый пост',
+            'group': self.group.pk,
+        })
+        self.assert_counts(1, 1, 0)
+        post = Post.objects.get()
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Пост в другой группе',
+                  'group': self.other_group.pk},
+        )
+        self.assert_counts(1, 0, 1)
+        Post.objects.get().delete()
+        self.assert_counts(0, 0, 0)
+
+    def test_bulk_create_updates_counters(self):
+        """bulk_create учитывается в счётчиках."""
+        Post.objects.bulk_create([Post(
+            author=self.user,
+            text=f'Тестовый пост {i}',
+            group=self.group if i % 2 else None,
+        ) for i in range(6)])
+        self.assert_counts(6, 3, 0)
+
+    def test_recount_command_fixes_drift(self):
+        """Команда recount_posts исправляет разошедшиеся счётчики."""
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        AuthorStats.objects.filter(author=self.user).update(posts_count=7)
+        Group.objects.filter(pk=self.other_group.pk).update(posts_count=3)
+        out = StringIO()
+        call_command('recount_posts', stdout=out)
+        self.assert_counts(1, 1, 0)
+        self.assertIn('авторов — 1', out.getvalue())
+
+    def test_pages_show_counters(self):
+        """Профиль и страница поста выводят счётчик автора."""
+        with run_commit_callbacks():
+            post = Post.objects.create(author=self.user, text='Пост')
+        AuthorStats.objects.filter(author=self.user).update(posts_count=42)
+        for url in (
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}),
+        ):
+            with self.subTest(url=url):
+                self.assertContains(self.authorized_client.get(url), '42')
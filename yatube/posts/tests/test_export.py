@@ -0,0 +1,95 @@
+import csv
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from posts.export import iter_author_posts
+from posts.models import Group, Post
+
+User = get_user_model()
+
+POSTS_COUNT = 25
+
+
+class PostExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Пост "{i}", с запятой\nи переводом строки',
+            group=cls.group if i % 2 else None,
+        ) for i in range(POSTS_COUNT)])
+        Post.objects.create(author=cls.other, text='Чужой пост')
+        cls.expected = list(Post.objects.filter(author=cls.user).order_by(
+            'pub_date', 'pk').values_list('pk', flat=True))
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.guest_client = Client()
+
+    def test_chunks_cover_all_author_posts(self):
+        """Порционная выборка отдаёт все посты автора по одному разу."""
+        for chunk_size in (1, 7, POSTS_COUNT, 100):
+            with self.subTest(chunk_size=chunk_size):
+                rows = list(iter_author_posts(self.user, chunk_size))
+                self.assertEqual([row[0] for row in rows], self.expected)
+
+    def test_chunk_queries(self):
+        """Каждая порция — один запрос."""
+        with self.assertNumQueries(4):
+            list(iter_author_posts(self.user, 7))
+
+    def test_ndjson_export(self):
+        """Выгрузка NDJSON отдаётся потоком, по объекту на строку."""
+        response = self.guest_client.get(reverse(
+            'posts:profile_export', kwargs={'username': 'auth'}))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'],
+                         'application/x-ndjson; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        posts = [json.loads(line) for line in lines]
+        self.assertEqual([post['id'] for post in posts], self.expected)
+        self.assertEqual(posts[1]['group'], 'test-slug')
+
+    def test_csv_export(self):
+        """Выгрузка CSV корректно экранирует текст постов."""
+        response = self.guest_client.get(reverse(
+            'posts:profile_export', kwargs={'username': 'auth'}),
+            {'format': 'csv'})
+        content = b''.join(response.streaming_content).decode()
+        header, *rows = csv.reader(StringIO(content))
+        self.assertEqual(header, ['id', 'pub_date', 'group', 'text'])
+        self.assertEqual([int(row[0]) for row in rows], self.expected)
+        self.assertEqual(rows[0][3],
+                         'Пост "0", с запятой\nи переводом строки')
+
+    def test_unknown_format_and_user(self):
+        """Неизвестный формат или автор дают 404."""
+        urls = (
+            reverse('posts:profile_export', kwargs={'username': 'auth'})
+            + '?format=xml',
+            reverse('posts:profile_export', kwargs={'username': 'nobody'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.guest_client.get(url).status_code, 404)
+
+    def test_export_command(self):
+        """Команда export_posts выгружает те же посты."""
+        out = StringIO()
+        call_command('export_posts', 'auth', '--chunk-size', '10',
+                     stdout=out)
+        posts = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([post['id'] for post in posts], self.expected)
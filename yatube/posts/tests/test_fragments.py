@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from core.testing import run_commit_callbacks
+from posts.caching import (FRAGMENT_MISSES_KEY, fragment_stats,
+                           reset_fragment_stats)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        reset_fragment_stats()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_fragment_is_shared_between_pages(self):
+        """Карточка, отрисованная на главной, берётся из кэша в профиле."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(fragment_stats()[:2], (0, 1))
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'}))
+        self.assertContains(response, 'Тестовый пост')
+        self.assertEqual(fragment_stats()[:2], (1, 1))
+
+    def test_post_edit_expires_fragment(self):
+        """После редактирования поста карточка перерисовывается."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Изменённый пост', 'group': ''},
+        )
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Изменённый пост')
+        self.assertNotContains(response, 'все записи группы')
+
+    def test_author_and_group_changes_expire_fragment(self):
+        """Смена имени автора и slug группы обновляют карточку."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.user.first_name = 'Лев'
+        self.user.last_name = 'Толстой'
+        self.group.slug = 'new-slug'
+        with run_commit_callbacks():
+            self.user.save()
+            self.group.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Лев Толстой')
+        self.assertContains(response, '/group/new-slug/')
+        self.assertEqual(fragment_stats()[:2], (0, 2))
+
+    def test_counts_reach_shared_cache_in_batches(self):
+        """Счётчики пишутся в общий кэш пачкой, а не на каждую карточку."""
+        url = reverse('posts:index')
+        with self.settings(FRAGMENT_STATS_FLUSH_EVERY=3,
+                           FRAGMENT_STATS_FLUSH_SECONDS=60):
+            self.authorized_client.get(url)
+            self.authorized_client.get(url)
+            self.assertIsNone(cache.get(FRAGMENT_MISSES_KEY))
+            self.authorized_client.get(url)
+            self.assertEqual(cache.get(FRAGMENT_MISSES_KEY), 1)
+        self.assertEqual(fragment_stats()[:2], (2, 1))
+
+    def test_stats_command_requires_shared_cache(self):
+        """Команда читает счётчики общего кэша и не врёт без него."""
+        self.authorized_client.get(reverse('posts:index'))
+        out = StringIO()
+        call_command('fragment_cache_stats', stdout=out)
+        self.assertIn('промахов: 1', out.getvalue())
+        with self.settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}):
+            with self.assertRaises(CommandError):
+                call_command('fragment_cache_stats', stdout=StringIO())
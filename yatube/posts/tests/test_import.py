@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from posts.importing import PostImporter
+from posts.models import AuthorStats, Group, Post
+from posts.signals import posts_bulk_created
+
+User = get_user_model()
+
+
+class PostImportTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, 'posts.ndjson')
+        self.checkpoint = self.path + '.checkpoint'
+
+    def write_dump(self, records):
+        with open(self.path, 'w', encoding='utf-8') as dump:
+            for record in records:
+                if isinstance(record, dict):
+                    record = json.dumps(record, ensure_ascii=False)
+                dump.write(record + '\n')
+
+    def test_import_preserves_fields(self):
+        """Импорт сохраняет автора, группу, текст и исходную дату."""
+        self.write_dump([{
+            'author': 'auth',
+            'group': 'test-slug',
+            'text': 'Импортированный пост',
+            'pub_date': '2015-03-01T12:00:00+00:00',
+        }])
+        stats = PostImporter().run(self.path)
+        post = Post.objects.get()
+        self.assertEqual(stats.imported, 1)
+        self.assertEqual(post.author, self.user)
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(post.text, 'Импортированный пост')
+        self.assertEqual(post.pub_date.year, 2015)
+
+    def test_invalid_rows_rejected(self):
+        """Битые строки и неизвестные авторы отклоняются, остальное — нет."""
+        self.write_dump([
+            '{не json',
+            {'author': 'auth'},
+            {'author': 'auth', 'text': '   '},
+            {'author': 'nobody', 'text': 'Пост'},
+            {'author': 'auth', 'group': 'nope', 'text': 'Пост'},
+            {'author': 'auth', 'text': 'Пост', 'pub_date': 'вчера'},
+            {'author': ['auth'], 'text': 'Пост'},
+            {'author': 'auth', 'group': {'slug': 'x'}, 'text': 'Пост'},
+            {'author': 'auth', 'text': 'Хороший пост'},
+        ])
+        errors = []
+        stats = PostImporter(
+            on_error=lambda line_no, message: errors.append(line_no),
+        ).run(self.path)
+        self.assertEqual(stats.imported, 1)
+        self.assertEqual(stats.rejected, 8)
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5, 6, 7, 8])
+
+    def test_lookups_batched(self):
+        """Авторы и группы порции ищутся одним запросом на модель."""
+        self.write_dump([
+            {'author': 'auth', 'group': 'test-slug', 'text': f'Пост {i}'}
+            for i in range(20)
+        ])
+        importer = PostImporter(batch_size=10)
+        with mock.patch.object(
+            importer, 'resolve', wraps=importer.resolve
+        ) as resolve:
+            importer.run(self.path)
+        self.assertEqual(resolve.call_count, 2)
+        self.assertEqual(Post.objects.count(), 20)
+
+    def test_resume_from_checkpoint(self):
+        """После сбоя импорт продолжается с последней сохранённой порции."""
+        self.write_dump([
+            {'author': 'auth', 'text': f'Пост {i}'} for i in range(25)
+        ])
+        original_flush = PostImporter.flush
+        calls = []
+
+        def failing_flush(importer, *args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            return original_flush(importer, *args)
+
+        with mock.patch.object(PostImporter, 'flush', failing_flush):
+            with self.assertRaises(RuntimeError):
+                PostImporter(batch_size=10,
+                             checkpoint=self.checkpoint).run(self.path)
+        self.assertEqual(Post.objects.count(), 10)
+        self.assertTrue(os.path.exists(self.checkpoint))
+        stats = PostImporter(batch_size=10,
+                             checkpoint=self.checkpoint).run(self.path)
+        self.assertEqual(stats.imported, 15)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            sorted(f'Пост {i}' for i in range(25)),
+        )
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_counters_updated(self):
+        """Импорт обновляет счётчики постов автора и группы."""
+        self.write_dump([
+            {'author': 'auth', 'group': 'test-slug', 'text': f'Пост {i}'}
+            for i in range(3)
+        ])
+        PostImporter().run(self.path)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 3)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count, 3)
+
+    def test_command_creates_missing(self):
+        """С --create-missing команда создаёт авторов и группы."""
+        self.write_dump([
+            {'author': 'newbie', 'group': 'new-group', 'text': 'Пост'},
+        ])
+        out, err = StringIO(), StringIO()
+        call_command('import_posts', self.path, '--create-missing',
+                     stdout=out, stderr=err)
+        post = Post.objects.get()
+        self.assertEqual(post.author.username, 'newbie')
+        self.assertFalse(post.author.has_usable_password())
+        self.assertEqual(post.group.slug, 'new-group')
+        self.assertIn('Импортировано постов: 1', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+    def test_concurrent_posts_keep_auto_now_add(self):
+        """Посты, созданные во время импорта, получают дату сами."""
+        created = []
+
+        def create_post(**kwargs):
+            created.append(Post.objects.create(
+                author=self.user, text='Пост из запроса'))
+
+        self.write_dump([{'author': 'auth', 'text': 'Старый пост',
+                          'pub_date': '2015-03-01T12:00:00+00:00'}])
+        posts_bulk_created.connect(create_post, sender=Post)
+        self.addCleanup(posts_bulk_created.disconnect, create_post,
+                        sender=Post)
+        PostImporter().run(self.path)
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        self.assertGreater(created[0].pub_date.year, 2015)
+        self.assertEqual(
+            Post.objects.get(text='Старый пост').pub_date.year, 2015)
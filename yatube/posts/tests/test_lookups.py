@@ -0,0 +1,140 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase, Client
+from django.urls import reverse
+from core.testing import run_commit_callbacks
+from posts import lookups
+from posts.caching import generation_key, group_page_scope
+from posts.lookups import LRUCache, get_author, get_group
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class LookupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        lookups.local_cache.clear()
+        self.guest_client = Client()
+
+    def test_repeated_lookup_without_queries(self):
+        """Повторный поиск группы и автора обходится без SQL."""
+        get_group('test-slug')
+        get_author('auth')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('test-slug'), self.group)
+            self.assertEqual(get_author('auth'), self.user)
+
+    def test_shared_cache_serves_other_processes(self):
+        """Пустой LRU другого процесса берёт объект из общего кэша."""
+        get_group('test-slug')
+        lookups.local_cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('test-slug'), self.group)
+
+    def test_local_hit_skips_shared_cache(self):
+        """Свежая запись LRU не обращается и к общему кэшу."""
+        get_group('test-slug')
+        with mock.patch.object(lookups, 'cache') as shared:
+            self.assertEqual(get_group('test-slug'), self.group)
+        self.assertEqual(shared.mock_calls, [])
+
+    def test_other_process_write_seen_after_local_timeout(self):
+        """Сдвиг поколения в другом процессе виден по истечении LRU."""
+        get_group('test-slug')
+        # Правка мимо сигналов этого процесса, как в другом процессе.
+        Group.objects.filter(pk=self.group.pk).update(title='Новое')
+        cache.incr(generation_key(group_page_scope('test-slug')))
+        self.assertEqual(get_group('test-slug').title, 'Тестовая группа')
+        with self.settings(LOOKUP_LOCAL_TIMEOUT=0):
+            self.assertEqual(get_group('test-slug').title, 'Новое')
+
+    def test_private_fields_not_cached(self):
+        """В кэш попадают только поля для лент, без пароля и почты."""
+        author = get_author('auth')
+        _, _, row = lookups.local_cache.get(('user', 'auth'))
+        self.assertEqual(row, (self.user.pk, 'auth', '', '', None))
+        self.assertIn('password', author.get_deferred_fields())
+
+    def test_save_and_delete_invalidate(self):
+        """Правка и удаление группы и автора видны сразу."""
+        get_group('test-slug')
+        get_author('auth')
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        with run_commit_callbacks():
+            group.save()
+        self.assertEqual(get_group('test-slug').title, 'Новое название')
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Лев'
+        with run_commit_callbacks():
+            user.save()
+        self.assertEqual(get_author('auth').first_name, 'Лев')
+        with run_commit_callbacks():
+            group.delete()
+            user.delete()
+        with self.assertRaises(Http404):
+            get_group('test-slug')
+        with self.assertRaises(Http404):
+            get_author('auth')
+
+    def test_post_write_refreshes_author_stats(self):
+        """Новый пост обновляет закэшированный счётчик постов автора."""
+        with run_commit_callbacks():
+            Post.objects.create(author=self.user, text='Тестовый пост')
+        self.assertEqual(get_author('auth').stats.posts_count, 1)
+        with run_commit_callbacks():
+            Post.objects.create(author=self.user, text='Ещё пост')
+        self.assertEqual(get_author('auth').stats.posts_count, 2)
+
+    def test_missing_objects_cached(self):
+        """Отсутствие группы и автора кэшируется и даёт 404."""
+        urls = (
+            reverse('posts:group_list', kwargs={'slug': 'nope'}),
+            reverse('posts:profile', kwargs={'username': 'nobody'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_created_objects_replace_missing(self):
+        """Созданные группа и автор не прячутся за отрицательной записью."""
+        with self.assertRaises(Http404):
+            get_group('new-slug')
+        with self.assertRaises(Http404):
+            get_author('newcomer')
+        with run_commit_callbacks():
+            group = Group.objects.create(
+                title='Новая группа', slug='new-slug', description='')
+            user = User.objects.create_user(username='newcomer')
+        self.assertEqual(get_group('new-slug'), group)
+        self.assertEqual(get_author('newcomer'), user)
+
+    def test_lru_evicts_least_recent(self):
+        """LRU вытесняет запись, к которой дольше всего не обращались."""
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(lru.get('c'), 3)
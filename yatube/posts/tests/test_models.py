@@ -30,6 +30,26 @@ class PostModelTest(TestCase):
         self.assertEqual(str(post), expected_post_str)
         self.assertEqual(str(group), 'Тестовая группа')
 
+    def test_excerpt_follows_text(self):
+        """Отрывок обновляется при создании, правке и массовой вставке."""
+        post = Post.objects.create(author=self.user,
+                                   text='Первая версия текста')
+        self.assertEqual(post.excerpt, 'Первая версия т')
+        post.text = 'Вторая версия текста'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, 'Вторая версия т')
+        Post.objects.bulk_create([
+            Post(author=self.user, text='Массовая вставка')])
+        self.assertEqual(Post.objects.filter(
+            text='Массовая вставка').get().excerpt, 'Массовая вставк')
+
+    def test_str_of_deferred_post_uses_excerpt(self):
+        """Пост без загруженного текста выводится отрывком без запросов."""
+        post = Post.objects.defer('text').get(pk=self.post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(post), self.post.text[:15])
+
     def test_post_verbose_name(self):
         """verbose_name в полях модели post совпадает с ожидаемым."""
         post = PostModelTest.post
@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, Client
+from django.urls import reverse
+from core.testing import run_commit_callbacks
+from posts import caching
+from posts.checks import check_shared_cache
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other_user = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+        Post.objects.create(
+            author=cls.other_user, text='Чужой пост', group=cls.other_group)
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_list',
+                             kwargs={'slug': 'test-slug'}),
+            'other_group': reverse('posts:group_list',
+                                   kwargs={'slug': 'other-slug'}),
+            'profile': reverse('posts:profile',
+                               kwargs={'username': 'auth'}),
+            'other_profile': reverse('posts:profile',
+                                     kwargs={'username': 'other'}),
+        }
+
+    def warm_up(self):
+        for url in self.urls.values():
+            self.guest_client.get(url)
+
+    def test_guest_pages_served_without_queries(self):
+        """Повторный запрос гостя отдаётся из кэша без SQL."""
+        self.warm_up()
+        for url in self.urls.values():
+            with self.subTest(url=url), self.assertNumQueries(0):
+                response = self.guest_client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_pages_are_cached_per_page_number(self):
+        """Номер страницы входит в ключ кэша."""
+        self.guest_client.get(self.urls['index'])
+        # Только сама страница: число постов уже в кэше.
+        with self.assertNumQueries(1):
+            self.guest_client.get(self.urls['index'] + '?page=2')
+
+    def test_authorized_user_is_not_served_from_cache(self):
+        """Авторизованный пользователь получает свежую страницу."""
+        self.warm_up()
+        response = self.authorized_client.get(self.urls['index'])
+        self.assertContains(response, 'Пользователь: auth')
+
+    def test_new_post_expires_only_its_pages(self):
+        """Новый пост сбрасывает только страницы, где он виден."""
+        self.warm_up()
+        with run_commit_callbacks():
+            self.authorized_client.post(reverse('posts:post_create'), data={
+                'text': 'Свежий пост',
+                'group': self.group.pk,
+            })
+        for name in ('index', 'group', 'profile'):
+            with self.subTest(page=name):
+                response = self.guest_client.get(self.urls[name])
+                self.assertContains(response, 'Свежий пост')
+        for name in ('other_group', 'other_profile'):
+            with self.subTest(page=name), self.assertNumQueries(0):
+                self.guest_client.get(self.urls[name])
+
+    def test_group_change_expires_old_and_new_group(self):
+        """Перенос поста в другую группу сбрасывает обе ленты групп."""
+        self.warm_up()
+        with run_commit_callbacks():
+            self.authorized_client.post(
+                reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+                data={'text': 'Тестовый пост', 'group': self.other_group.pk},
+            )
+        self.assertNotContains(
+            self.guest_client.get(self.urls['group']), 'Тестовый пост')
+        self.assertContains(
+            self.guest_client.get(self.urls['other_group']), 'Тестовый пост')
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_rejected(self):
+        """Проверка запуска не пускает кэш в памяти одного процесса."""
+        self.assertEqual(check_shared_cache(None), [])
+        with self.settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}):
+            errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ['posts.E001'])
+
+
+class CommitInvalidationTests(TransactionTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(username='auth')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='')
+        self.post = Post.objects.create(author=self.user, text='Пост')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_caches_expire_after_commit(self):
+        """Поколения и число постов сбрасываются только после коммита.
+
+        Иначе гость между сбросом и коммитом закэширует старые строки
+        под новым поколением.
+        """
+        in_transaction = []
+
+        def record(function):
+            def wrapper(*args, **kwargs):
+                in_transaction.append(connection.in_atomic_block)
+                return function(*args, **kwargs)
+            return wrapper
+
+        with mock.patch.object(caching, '_bump', record(caching._bump)), \
+                mock.patch.object(cache, 'delete', record(cache.delete)):
+            self.authorized_client.post(
+                reverse('posts:post_create'), {'text': 'Новый пост'})
+            self.authorized_client.post(
+                reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+                {'text': 'Правка', 'group': self.group.pk})
+            self.group.title = 'Новое название'
+            self.group.save()
+        self.assertTrue(in_transaction)
+        self.assertNotIn(True, in_transaction)
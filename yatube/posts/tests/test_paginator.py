@@ -0,0 +1,222 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from core.testing import run_commit_callbacks
+from posts.counting import all_posts_count
+from posts.models import Post
+from posts.paginator import (BACKWARD, FORWARD, CountedPaginator,
+                             KeysetPage, KeysetPaginator, WindowedPaginator,
+                             encode_cursor, pagination)
+
+User = get_user_model()
+
+PER_PAGE = 4
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Тестовый пост {i}',
+        ) for i in range(1, 13)])
+        # Одинаковая дата у всех постов проверяет разрешение по id.
+        same_date = timezone.now() - timedelta(days=1)
+        Post.objects.all().update(pub_date=same_date)
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True)
+        )
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.paginator = KeysetPaginator(Post.objects.all(), PER_PAGE)
+
+    def test_forward_walk_covers_all_posts(self):
+        """Проход вперёд по курсорам выдаёт все посты ровно один раз."""
+        seen = []
+        page = self.paginator.get_page(None)
+        self.assertFalse(page.has_previous())
+        while True:
+            seen.extend(post.pk for post in page)
+            if not page.has_next():
+                break
+            page = self.paginator.get_page(page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_walk_returns_same_pages(self):
+        """Курсор «назад» возвращает предыдущую страницу целиком."""
+        first = self.paginator.get_page(None)
+        second = self.paginator.get_page(first.next_cursor)
+        back = self.paginator.get_page(second.previous_cursor)
+        self.assertEqual([p.pk for p in back], [p.pk for p in first])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_page_query_count_does_not_depend_on_depth(self):
+        """Каждая страница обходится одним запросом."""
+        page = self.paginator.get_page(None)
+        while page.has_next():
+            with self.assertNumQueries(1):
+                page = self.paginator.get_page(page.next_cursor)
+
+    def test_broken_cursor_returns_first_page(self):
+        """Повреждённый курсор не ломает страницу."""
+        for cursor in ('garbage', '!!!', 'WyJ4Il0'):
+            with self.subTest(cursor=cursor):
+                page = self.paginator.get_page(cursor)
+                self.assertEqual(
+                    [p.pk for p in page], self.expected[:PER_PAGE])
+
+    @override_settings(PAGINATION_MODE='keyset')
+    def test_cursor_past_last_post_returns_first_page(self):
+        """Курсор за последним постом (после удаления) даёт первую страницу."""
+        oldest = Post.objects.order_by('pub_date', 'pk').first()
+        newest = Post.objects.order_by('-pub_date', '-pk').first()
+        cursors = (encode_cursor(FORWARD, oldest),
+                   encode_cursor(BACKWARD, newest))
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                page = self.paginator.get_page(cursor)
+                self.assertEqual(
+                    [p.pk for p in page], self.expected[:PER_PAGE])
+                self.assertFalse(page.has_previous())
+                response = Client().get(
+                    reverse('posts:index'), {'cursor': cursor})
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_pagination_helper_switches_mode(self):
+        """Хелпер pagination выбирает движок по настройке."""
+        request = RequestFactory().get('/')
+        with override_settings(PAGINATION_MODE='keyset'):
+            page = pagination(request, Post.objects.all(), PER_PAGE)
+        self.assertIsInstance(page, KeysetPage)
+        page = pagination(request, Post.objects.all(), PER_PAGE)
+        self.assertNotIsInstance(page, KeysetPage)
+
+    @override_settings(PAGINATION_MODE='keyset')
+    def test_index_renders_keyset_links(self):
+        """Главная страница в режиме keyset выводит ссылки с курсором."""
+        response = Client().get(reverse('posts:index'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        page = response.context['page_obj']
+        self.assertContains(response, f'?cursor={page.next_cursor}')
+        self.assertNotContains(response, '?page=')
+
+
+class CountedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Тестовый пост {i}',
+        ) for i in range(1, 11)])
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def paginator(self, count):
+        remembered = []
+        paginator = CountedPaginator(
+            Post.objects.all(), PER_PAGE, lambda: (count, False),
+            remember=remembered.append)
+        return paginator, remembered
+
+    def test_index_count_cached(self):
+        """Число постов главной считается один раз до новой записи."""
+        self.assertEqual(all_posts_count(), (10, True))
+        with self.assertNumQueries(0):
+            self.assertEqual(all_posts_count(), (10, True))
+        with run_commit_callbacks():
+            Post.objects.create(author=self.user, text='Новый пост')
+        self.assertEqual(all_posts_count(), (11, True))
+        with run_commit_callbacks():
+            Post.objects.filter(text='Новый пост').delete()
+        self.assertEqual(all_posts_count(), (10, True))
+
+    def test_group_and_profile_pages_do_not_count(self):
+        """Ленты автора и группы берут число постов из счётчиков."""
+        with CaptureQueriesContext(connection) as context:
+            self.authorized_client.get(
+                reverse('posts:profile', kwargs={'username': 'auth'}))
+        self.assertFalse(any('COUNT(' in query['sql']
+                             for query in context.captured_queries))
+
+    @override_settings(PAGINATION_ESTIMATE_THRESHOLD=5)
+    def test_estimate_above_threshold(self):
+        """Выше порога главная нумерует страницы по оценке без COUNT."""
+        count, exact = all_posts_count()
+        self.assertFalse(exact)
+        self.assertGreaterEqual(count, 10)
+        page = pagination(RequestFactory().get('/'), Post.objects.all(),
+                          PER_PAGE, count=all_posts_count)
+        self.assertEqual(len(page), PER_PAGE)
+
+    def test_partial_page_makes_count_exact(self):
+        """Неполная страница уточняет оценку без COUNT(*)."""
+        paginator, remembered = self.paginator(100)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(3)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(paginator.count, 10)
+        self.assertFalse(page.has_next())
+        self.assertEqual(remembered, [10])
+
+    def test_empty_deep_page_falls_back_to_last(self):
+        """Страница за концом оценки ведёт на последнюю непустую."""
+        paginator, remembered = self.paginator(100)
+        page = paginator.get_page(20)
+        self.assertEqual(page.number, 3)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(remembered, [10])
+
+
+class PageWindowTests(TestCase):
+    def paginator(self, pages):
+        return CountedPaginator([], 10, lambda: (pages * 10, True))
+
+    def test_small_range_is_not_elided(self):
+        """Немного страниц выводятся все без многоточий."""
+        page = self.paginator(10).get_page(5)
+        self.assertEqual(page.page_window, list(range(1, 11)))
+
+    def test_window_around_current_page(self):
+        """Окно: края, соседи текущей страницы и многоточия."""
+        ellipsis = WindowedPaginator.ELLIPSIS
+        cases = {
+            1: [1, 2, 3, 4, ellipsis, 99, 100],
+            50: [1, 2, ellipsis, 47, 48, 49, 50, 51, 52, 53, ellipsis,
+                 99, 100],
+            100: [1, 2, ellipsis, 97, 98, 99, 100],
+        }
+        paginator = self.paginator(100)
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    paginator.get_page(number).page_window, expected)
+
+    def test_rendered_links_do_not_grow(self):
+        """Число ссылок в навигации не зависит от числа страниц."""
+        sizes = []
+        for pages in (100, 100_000):
+            page = self.paginator(pages).get_page(pages // 2)
+            html = render_to_string('posts/includes/paginator.html',
+                                    {'page_obj': page})
+            sizes.append(html.count('<li'))
+        self.assertEqual(sizes[0], sizes[1])
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+from posts import lookups, urls as posts_urls
+from posts.models import Post, Group
+
+User = get_user_model()
+
+# Допустимое число SQL-запросов на страницу: (гость, автор поста).
+# Авторизованный клиент дополнительно читает сессию и пользователя.
+QUERY_BUDGETS = {
+    'index': (2, 4),
+    'group_list': (2, 4),
+    'profile': (2, 4),
+    'profile_export': (1, 1),
+    'post_detail': (2, 4),
+    'post_create': (0, 3),
+    'post_edit': (0, 4),
+    'search': (3, 5),
+    'archive': (2, 4),
+    'group_archive': (2, 4),
+    'author_archive': (2, 4),
+}
+
+POSTS_COUNT = 15
+
+
+class PostsQueryBudgetTests(TestCase):
+    """Число запросов на страницах не зависит от числа постов на них."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        authors = [
+            User.objects.create_user(username=f'author{i}')
+            for i in range(POSTS_COUNT)
+        ]
+        groups = [Group.objects.create(
+            title=f'Группа {i}',
+            slug=f'group-{i}',
+            description='Тестовое описание',
+        ) for i in range(POSTS_COUNT)]
+        Post.objects.bulk_create([Post(
+            author=author,
+            text=f'Тестовый пост {i}',
+            group=group,
+        ) for i, (author, group) in enumerate(zip(authors, groups))])
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Тестовый пост автора {i}',
+            group=groups[i] if i % 2 else cls.group,
+        ) for i in range(POSTS_COUNT)])
+        cls.post = Post.objects.filter(author=cls.user).first()
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        lookups.local_cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def urls(self):
+        today = timezone.localdate()
+        year, month = today.year, today.month
+        return {
+            'index': reverse('posts:index'),
+            'group_list': reverse(
+                'posts:group_list', kwargs={'slug': 'test-slug'}),
+            'profile': reverse(
+                'posts:profile', kwargs={'username': 'auth'}),
+            'profile_export': reverse(
+                'posts:profile_export', kwargs={'username': 'auth'}),
+            'post_detail': reverse(
+                'posts:post_detail', kwargs={'post_id': self.post.pk}),
+            'post_create': reverse('posts:post_create'),
+            'post_edit': reverse(
+                'posts:post_edit', kwargs={'post_id': self.post.pk}),
+            'search': reverse('posts:search') + '?q=тестовый',
+            'archive': reverse('posts:archive', kwargs={'year': year}),
+            'group_archive': reverse('posts:group_archive', kwargs={
+                'slug': 'test-slug', 'year': year, 'month': month}),
+            'author_archive': reverse('posts:author_archive', kwargs={
+                'username': 'auth', 'year': year, 'month': month,
+                'day': today.day}),
+        }
+
+    def consume(self, response):
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def test_every_url_has_budget(self):
+        """У каждого маршрута posts.urls есть бюджет запросов."""
+        names = {pattern.name for pattern in posts_urls.urlpatterns}
+        self.assertEqual(names, set(QUERY_BUDGETS))
+
+    def test_guest_query_budgets(self):
+        """Гость укладывается в бюджет запросов на публичных страницах."""
+        for name, url in self.urls().items():
+            guest_budget, _ = QUERY_BUDGETS[name]
+            with self.subTest(url=url), self.assertNumQueries(guest_budget):
+                self.consume(self.guest_client.get(url))
+
+    def test_authorized_query_budgets(self):
+        """Автор укладывается в бюджет запросов на всех страницах."""
+        for name, url in self.urls().items():
+            _, author_budget = QUERY_BUDGETS[name]
+            with self.subTest(url=url):
+                with self.assertNumQueries(author_budget):
+                    response = self.consume(self.authorized_client.get(url))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
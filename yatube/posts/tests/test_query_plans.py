@@ -0,0 +1,94 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Post, Group
+
+User = get_user_model()
+
+POSTS_TABLE = Post._meta.db_table
+
+# SQLite пишет «SCAN t», если таблица читается целиком без индекса,
+# и «USE TEMP B-TREE», если сортировку пришлось делать отдельно.
+FULL_SCAN_RE = re.compile(rf'\bSCAN (TABLE )?{POSTS_TABLE}\b(?! USING)')
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE')
+
+
+class PostQueryPlanTests(TestCase):
+    """Запросы к постам на всех страницах приложения идут по индексам."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Тестовый пост {i}',
+            group=cls.group,
+        ) for i in range(1, 26)])
+        cls.post = Post.objects.first()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def view_urls(self):
+        post_id = self.post.pk
+        return (
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+            + '?page=2',
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:profile', kwargs={'username': 'auth'})
+            + '?page=2',
+            reverse('posts:profile_export', kwargs={'username': 'auth'}),
+            reverse('posts:post_detail', kwargs={'post_id': post_id}),
+            reverse('posts:post_create'),
+            reverse('posts:post_edit', kwargs={'post_id': post_id}),
+            reverse('posts:search') + '?q=тестовый',
+        )
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_plans_use_indexes(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        for query in context.captured_queries:
+            sql = query['sql']
+            if POSTS_TABLE not in sql or not sql.startswith('SELECT'):
+                continue
+            plan = '\n'.join(self.explain(sql))
+            with self.subTest(url=url, sql=sql):
+                self.assertNotRegex(plan, FULL_SCAN_RE)
+                self.assertNotRegex(plan, TEMP_SORT_RE)
+
+    def test_offset_pages_use_indexes(self):
+        """Страницы с нумерацией не сканируют и не сортируют посты."""
+        for url in self.view_urls():
+            self.assert_plans_use_indexes(url)
+
+    @override_settings(PAGINATION_MODE='keyset')
+    def test_keyset_pages_use_indexes(self):
+        """Курсорные страницы не сканируют и не сортируют посты."""
+        for url in self.view_urls():
+            self.assert_plans_use_indexes(url)
+        response = self.client.get(reverse('posts:index'))
+        cursor = response.context['page_obj'].next_cursor
+        self.assert_plans_use_indexes(
+            reverse('posts:index') + f'?cursor={cursor}')
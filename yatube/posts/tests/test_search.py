@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+from posts.models import Post
+from posts.search import build_match_query, search_posts
+
+User = get_user_model()
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+        cls.rare = Post.objects.create(
+            author=cls.user, text='Кошки спят. Собаки лают.')
+        cls.frequent = Post.objects.create(
+            author=cls.user, text='Кошки, кошки, кошки повсюду!')
+        Post.objects.bulk_create([Post(
+            author=cls.user,
+            text=f'Тестовый пост {i}',
+        ) for i in range(15)])
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.guest_client = Client()
+
+    def found(self, text):
+        return [post.pk for post in search_posts(text)[:100]]
+
+    def test_results_are_ranked(self):
+        """Пост с большим числом совпадений выше в выдаче."""
+        self.assertEqual(self.found('кошки'),
+                         [self.frequent.pk, self.rare.pk])
+
+    def test_last_word_matches_prefix(self):
+        """Последнее слово запроса ищется по префиксу."""
+        self.assertEqual(self.found('соба'), [self.rare.pk])
+
+    def test_index_follows_edits_and_deletes(self):
+        """Индекс обновляется при правке и удалении поста."""
+        post = Post.objects.get(pk=self.rare.pk)
+        post.text = 'Попугаи говорят'
+        post.save()
+        self.assertEqual(self.found('собаки'), [])
+        self.assertEqual(self.found('попугаи'), [self.rare.pk])
+        post.delete()
+        self.assertEqual(self.found('попугаи'), [])
+
+    def test_operators_in_query_are_escaped(self):
+        """Синтаксис FTS5 во вводе не ломает поиск."""
+        for text in ('"кошки', 'кошки OR', 'NEAR(', '*', 'col:кошки'):
+            with self.subTest(text=text):
+                self.assertIsInstance(build_match_query(text), str)
+                search_posts(text)[:10]
+
+    def test_search_page_is_paginated(self):
+        """Страница поиска делит выдачу на страницы и сохраняет запрос."""
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'тестовый'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTemplateUsed(response, 'posts/search.html')
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.paginator.count, 15)
+        self.assertEqual(len(page_obj), 10)
+        self.assertContains(response, '?q=%D1%82%D0%B5%D1%81%D1%82'
+                                      '%D0%BE%D0%B2%D1%8B%D0%B9&amp;page=2')
+
+    def test_empty_query_shows_form_only(self):
+        """Без запроса страница поиска показывает только форму."""
+        response = self.guest_client.get(reverse('posts:search'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotIn('page_obj', response.context)
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке находит посты через полнотекстовый индекс."""
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'собаки'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            [post.pk for post in response.context['cl'].result_list],
+            [self.rare.pk])
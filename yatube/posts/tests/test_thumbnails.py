@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import (TestCase, TransactionTestCase, Client,
+                         override_settings)
+from django.urls import reverse
+from core.testing import run_commit_callbacks
+from posts.models import Post
+from posts.thumbnails import cached_thumbnail, generate_thumbnails
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def uploaded_gif(name):
+    return SimpleUploadedFile(name, SMALL_GIF, content_type='image/gif')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, THUMBNAIL_WORKERS=0)
+class PostThumbnailTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_form_saves_image(self):
+        """Форма создания поста сохраняет загруженную картинку."""
+        self.authorized_client.post(reverse('posts:post_create'), {
+            'text': 'Пост с картинкой',
+            'image': uploaded_gif('form.gif'),
+        })
+        post = Post.objects.get(text='Пост с картинкой')
+        self.assertEqual(post.image.name, 'posts/form.gif')
+
+    def test_pages_do_not_resize_inline(self):
+        """Страницы не режут картинки: без миниатюры пост — оригинал."""
+        post = Post.objects.create(author=self.user, text='Пост',
+                                   image=uploaded_gif('inline.gif'))
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotContains(response, '<img class="card-img')
+        response = self.authorized_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}))
+        self.assertContains(response, f'src="{post.image.url}"')
+        for size in settings.POST_THUMBNAIL_SIZES:
+            self.assertIsNone(cached_thumbnail(post.image, size))
+
+    def test_command_regenerates_missing(self):
+        """Команда нарезает миниатюры, которые потерял пул."""
+        post = Post.objects.create(author=self.user, text='Пост',
+                                   image=uploaded_gif('lost.gif'))
+        Post.objects.create(author=self.user, text='Без картинки')
+        self.authorized_client.get(reverse('posts:index'))
+        out = StringIO()
+        with run_commit_callbacks():
+            call_command('regenerate_thumbnails', stdout=out)
+        self.assertIn('постов: 1.', out.getvalue())
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(
+            response, f'src="{cached_thumbnail(post.image, "list").url}"')
+        call_command('regenerate_thumbnails', stdout=out)
+        self.assertIn('постов: 0.', out.getvalue())
+
+    def test_generated_thumbnails_are_rendered(self):
+        """После нарезки ленты и пост показывают свои миниатюры."""
+        post = Post.objects.create(author=self.user, text='Пост',
+                                   image=uploaded_gif('ready.gif'))
+        done = []
+        generate_thumbnails(post.image.name, on_done=lambda: done.append(1))
+        self.assertEqual(done, [1])
+        generate_thumbnails(post.image.name, on_done=lambda: done.append(2))
+        self.assertEqual(done, [1])
+        pages = {
+            'list': reverse('posts:index'),
+            'detail': reverse('posts:post_detail',
+                              kwargs={'post_id': post.pk}),
+        }
+        for size, url in pages.items():
+            with self.subTest(size=size):
+                thumbnail = cached_thumbnail(post.image, size)
+                response = self.authorized_client.get(url)
+                self.assertContains(response, f'src="{thumbnail.url}"')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, THUMBNAIL_WORKERS=1)
+class PostThumbnailPoolTests(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_thumbnails_generated_after_commit(self):
+        """Сохранение поста с картинкой запускает нарезку в пуле."""
+        cache.clear()
+        user = User.objects.create_user(username='auth')
+        post = Post.objects.create(author=user, text='Пост',
+                                   image=uploaded_gif('pool.gif'))
+        deadline = time.monotonic() + 10
+        while cached_thumbnail(post.image, 'list') is None:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+        self.assertIsNotNone(cached_thumbnail(post.image, 'detail'))
@@ -1,5 +1,6 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from posts.models import Post, Group
 from django.urls import reverse
 from http import HTTPStatus
@@ -38,6 +39,8 @@ class PostsURLTests(TestCase):
 
     def setUp(self) -> None:
         super().setUp()
+        # Страницы лент кэшируются для гостей — каждый тест рендерит заново.
+        cache.clear()
         self.guest_client = Client()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
@@ -2,8 +2,12 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django import forms
+from django.test.utils import CaptureQueriesContext
 from http import HTTPStatus
+from posts import lookups
 from posts.models import Post, Group
 
 
@@ -38,6 +42,8 @@ class PostsPagesTests(TestCase):
 
     def setUp(self) -> None:
         super().setUp()
+        cache.clear()
+        lookups.local_cache.clear()
         self.guest_client = Client()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
@@ -199,3 +205,21 @@ class PostsPagesTests(TestCase):
         ))
         self.assertTemplateNotUsed(response, 'posts/create_post.html')
         self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_list_pages_do_not_load_text(self):
+        """Ленты читают отрывок поста, а не полный текст."""
+        cache.clear()
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug1'}),
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:search') + '?q=Тестовый',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.guest_client.get(url)
+                self.assertContains(response, 'Тестовый пост 1')
+                self.assertFalse(any(
+                    '"posts_post"."text"' in query['sql']
+                    for query in queries.captured_queries))
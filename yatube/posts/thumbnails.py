@@ -0,0 +1,97 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class PostThumbnailBackend(ThumbnailBackend):
+    """Бэкенд sorl-thumbnail, умеющий искать миниатюру без нарезки."""
+
+    def get_cached_thumbnail(self, file_, geometry_string, **options):
+        """Возвращает готовую миниатюру из хранилища ключей или None.
+
+        Имя миниатюры вычисляется так же, как в get_thumbnail, но
+        оригинал не открывается и ничего не создаётся.
+        """
+        source = ImageFile(file_)
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+def cached_thumbnail(image, size):
+    """Готовая миниатюра размера size из POST_THUMBNAIL_SIZES или None."""
+    if not image:
+        return None
+    geometry, options = settings.POST_THUMBNAIL_SIZES[size]
+    return default.backend.get_cached_thumbnail(
+        image, geometry, **options)
+
+
+def missing_sizes(image):
+    return [size for size in settings.POST_THUMBNAIL_SIZES
+            if cached_thumbnail(image, size) is None]
+
+
+def generate_thumbnails(image, on_done=None):
+    """Нарезает недостающие миниатюры; вызывает on_done, если нарезал.
+
+    Возвращает, были ли нарезаны новые миниатюры.
+    """
+    try:
+        sizes = missing_sizes(image)
+        for size in sizes:
+            geometry, options = settings.POST_THUMBNAIL_SIZES[size]
+            default.backend.get_thumbnail(image, geometry, **options)
+        if sizes and on_done is not None:
+            on_done()
+        return bool(sizes)
+    except Exception:
+        logger.exception('Не удалось нарезать миниатюры для %s', image)
+        return False
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                thread_name_prefix='thumbnails',
+            )
+        return _executor
+
+
+def schedule_thumbnails(image, on_done=None):
+    """Ставит нарезку миниатюр в пул потоков вне запроса.
+
+    При THUMBNAIL_WORKERS = 0 миниатюры режутся сразу в текущем потоке.
+    Очередь пула живёт только в памяти процесса: задачи, не успевшие
+    выполниться до его перезапуска, доделывает regenerate_thumbnails.
+    """
+    if not settings.THUMBNAIL_WORKERS:
+        generate_thumbnails(image, on_done)
+        return None
+    return get_executor().submit(generate_thumbnails, image, on_done)
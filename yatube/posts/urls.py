@@ -6,7 +6,23 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('profile/<str:username>/export/', views.profile_export,
+         name='profile_export'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
-    path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit')
+    path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('search/', views.search, name='search'),
 ]
+
+# Архив по датам: весь сайт, группа и автор; одно имя на каждый вариант,
+# reverse выбирает шаблон по переданным year, month и day.
+ARCHIVE_PERIODS = (
+    'archive/<int:year>/',
+    'archive/<int:year>/<int:month>/',
+    'archive/<int:year>/<int:month>/<int:day>/',
+)
+for prefix, name in (('', 'archive'),
+                     ('group/<slug:slug>/', 'group_archive'),
+                     ('profile/<str:username>/', 'author_archive')):
+    urlpatterns += [path(prefix + period, views.archive_posts, name=name)
+                    for period in ARCHIVE_PERIODS]
@@ -1,29 +1,56 @@
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
-from .models import Post, Group, User
+from django.utils.http import urlencode
+from core.sqlite import retry_on_lock
+from . import archive
+from .models import Post
 from .forms import PostForm
+from .caching import (cache_anonymous_page, archive_page_scope,
+                      author_page_scope, group_page_scope, INDEX_PAGE_SCOPE)
+from .conditional import (conditional_page, author_state, group_state,
+                          index_state, post_state)
+from .counting import (all_posts_count, remember_all_posts_count,
+                       stored_count)
+from .lookups import get_author, get_group
 from .paginator import pagination
+from .search import search_posts
+from .export import CONTENT_TYPES, export_lines
 
 
+@cache_anonymous_page(lambda: INDEX_PAGE_SCOPE)
+@conditional_page(index_state)
 def index(request):
-    post_list = Post.objects.all()
-    page_obj = pagination(request, post_list, settings.POSTS_NUM)
+    # Лентам хватает отрывка, полный текст читает только post_detail.
+    post_list = Post.objects.select_related('author', 'group').defer('text')
+    page_obj = pagination(request, post_list, settings.POSTS_NUM,
+                          count=all_posts_count,
+                          remember_count=remember_all_posts_count)
     return render(request, 'posts/index.html', {'page_obj': page_obj})
 
 
+@cache_anonymous_page(group_page_scope)
+@conditional_page(group_state)
 def group_posts(request, slug: str):
-    group = get_object_or_404(Group, slug=slug)
-    post_list = Post.objects.filter(group=group)
-    page_obj = pagination(request, post_list, settings.POSTS_NUM)
+    group = get_group(slug)
+    post_list = group.posts.select_related('author').defer('text')
+    page_obj = pagination(request, post_list, settings.POSTS_NUM,
+                          count=stored_count(group.posts_count))
     return render(request, 'posts/group_list.html', {'group': group,
                                                      'page_obj': page_obj})
 
 
+@cache_anonymous_page(author_page_scope)
+@conditional_page(author_state)
 def profile(request, username: str):
-    user = User.objects.get(username=username)
-    post_list = Post.objects.filter(author=user)
-    page_obj = pagination(request, post_list, settings.POSTS_NUM)
+    user = get_author(username)
+    stats = getattr(user, 'stats', None)
+    post_list = user.posts.select_related('group').defer('text')
+    page_obj = pagination(request, post_list, settings.POSTS_NUM,
+                          count=stored_count(stats.posts_count if stats
+                                             else 0))
     context = {
         'username': user,
         'page_obj': page_obj,
@@ -31,18 +58,105 @@ def profile(request, username: str):
     return render(request, 'posts/profile.html', context)
 
 
+@cache_anonymous_page(archive_page_scope)
+def archive_posts(request, year: int, month: int = None, day: int = None,
+                  slug: str = None, username: str = None):
+    try:
+        start, end = archive.period_bounds(year, month, day)
+    except ValueError:
+        raise Http404('Такой даты нет')
+    post_list = Post.objects.select_related('author', 'group').defer('text')
+    owner, owner_kwargs, url_name = None, {}, 'posts:archive'
+    scope = archive.ALL_SCOPE
+    if slug is not None:
+        owner = get_group(slug)
+        post_list = post_list.filter(group=owner)
+        scope = archive.group_scope(owner.pk)
+        owner_kwargs, url_name = {'slug': slug}, 'posts:group_archive'
+    elif username is not None:
+        owner = get_author(username)
+        post_list = post_list.filter(author=owner)
+        scope = archive.author_scope(owner.pk)
+        owner_kwargs = {'username': username}
+        url_name = 'posts:author_archive'
+
+    def link(*parts):
+        return reverse(url_name, kwargs={
+            **owner_kwargs, **dict(zip(('year', 'month', 'day'), parts))})
+
+    # Навигация года — по месяцам, месяца и дня — по дням месяца;
+    # числа постов берутся из дней архива, а не из таблицы постов.
+    if month is None:
+        days = archive.day_counts(scope, start, end)
+        choices = [(first, total, link(year, first.month))
+                   for first, total in archive.month_counts(days)]
+        total, up_url = sum(count for _, count in days), None
+    else:
+        days = archive.day_counts(scope, *archive.period_bounds(year, month))
+        choices = [(date, count, link(year, month, date.day))
+                   for date, count in days]
+        if day is None:
+            total, up_url = sum(count for _, count in days), link(year)
+        else:
+            total = dict(days).get(start, 0)
+            up_url = link(year, month)
+    page_obj = pagination(request,
+                          archive.posts_between(post_list, start, end),
+                          settings.POSTS_NUM, count=stored_count(total))
+    context = {
+        'owner': owner,
+        'period': 'day' if day else 'month' if month else 'year',
+        'start': start,
+        'choices': choices,
+        'total': total,
+        'up_url': up_url,
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/archive.html', context)
+
+
+def profile_export(request, username: str):
+    user = get_author(username)
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in CONTENT_TYPES:
+        raise Http404('Неизвестный формат выгрузки')
+    response = StreamingHttpResponse(
+        export_lines(user, export_format),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{user.username}-posts.{export_format}"')
+    return response
+
+
+@conditional_page(post_state)
 def post_detail(request, post_id: int):
-    post = Post.objects.get(pk=post_id)
+    post = Post.objects.select_related(
+        'author__stats', 'group').get(pk=post_id)
     context = {
         'post': post,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    context = {'query': query}
+    if query:
+        results = search_posts(query, Post.objects.select_related(
+            'author', 'group').defer('text'))
+        # Выдача упорядочена по релевантности, курсор по дате не подходит.
+        context['page_obj'] = pagination(
+            request, results, settings.POSTS_NUM, mode='offset')
+        context['page_query'] = urlencode({'q': query}) + '&'
+    return render(request, 'posts/search.html', context)
+
+
 @login_required
+@retry_on_lock
 def post_create(request):
     if request.method == 'POST':
-        form = PostForm(request.POST)
+        form = PostForm(request.POST, files=request.FILES)
         if form.is_valid():
             user = request.user
             form.instance.author = user
@@ -54,10 +168,12 @@ def post_create(request):
 
 
 @login_required
+@retry_on_lock
 def post_edit(request, post_id: int):
     post = get_object_or_404(Post, pk=post_id)
-    if post.author == request.user:
-        form = PostForm(request.POST or None, instance=post)
+    if post.author_id == request.user.pk:
+        form = PostForm(request.POST or None, files=request.FILES or None,
+                        instance=post)
         if form.is_valid():
             form.instance.author = request.user
             form.save()
@@ -0,0 +1,125 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """EMAIL_BACKEND, который кладёт письма в очередь в базе.
+
+    Вызов стоит одного INSERT и не зависит от почтового сервера.
+    Вложения не поддерживаются: в очередь попадают только текст
+    и альтернативы (HTML-версия письма).
+    """
+
+    def send_messages(self, email_messages):
+        queued = []
+        for message in email_messages:
+            if message.attachments:
+                if self.fail_silently:
+                    continue
+                raise ValueError('Очередь писем не хранит вложения')
+            queued.append(OutgoingEmail(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                to=json.dumps(message.to),
+                extra=json.dumps({
+                    'cc': message.cc,
+                    'bcc': message.bcc,
+                    'reply_to': message.reply_to,
+                    'headers': message.extra_headers,
+                    'alternatives': getattr(message, 'alternatives', []),
+                }),
+            ))
+        OutgoingEmail.objects.bulk_create(queued)
+        return len(queued)
+
+
+def build_message(email, connection):
+    extra = json.loads(email.extra)
+    return EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=json.loads(email.to),
+        cc=extra.get('cc'),
+        bcc=extra.get('bcc'),
+        reply_to=extra.get('reply_to'),
+        headers=extra.get('headers'),
+        alternatives=[tuple(alt) for alt in extra.get('alternatives', [])],
+        connection=connection,
+    )
+
+
+def claim_batch(batch_size):
+    """Забирает до batch_size писем, которым пора уходить.
+
+    Письмо сдвигается на EMAIL_QUEUE_LEASE вперёд условным UPDATE,
+    поэтому параллельный обработчик его не возьмёт, а письмо упавшего
+    обработчика вернётся в работу по истечении аренды.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.EMAIL_QUEUE_LEASE)
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.QUEUED, next_attempt_at__lte=now)
+    claimed = []
+    for email in due[:batch_size]:
+        if due.filter(pk=email.pk).update(next_attempt_at=lease_until):
+            claimed.append(email)
+    return claimed
+
+
+def retry_later(email, error):
+    email.attempts += 1
+    email.last_error = f'{type(error).__name__}: {error}'
+    if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.FAILED
+    else:
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    email.save(update_fields=['attempts', 'last_error', 'status',
+                              'next_attempt_at'])
+
+
+def drain_queue(batch_size=None):
+    """Отправляет одну порцию писем через EMAIL_QUEUE_BACKEND.
+
+    Порция уходит через одно соединение. У отправленного письма текст
+    и прочие поля стираются. Неудачные письма получают повтор
+    с экспоненциальной задержкой, после EMAIL_QUEUE_MAX_ATTEMPTS
+    попыток — статус «не отправлено». Возвращает (отправлено, ошибок).
+    """
+    batch = claim_batch(batch_size or settings.EMAIL_QUEUE_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+    connection = get_connection(settings.EMAIL_QUEUE_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in batch:
+            retry_later(email, error)
+        return 0, len(batch)
+    sent = failed = 0
+    try:
+        for email in batch:
+            try:
+                build_message(email, connection).send()
+            except Exception as error:
+                retry_later(email, error)
+                failed += 1
+                continue
+            email.status = OutgoingEmail.SENT
+            email.sent_at = timezone.now()
+            # В тексте могут быть действующие ссылки сброса пароля.
+            email.body, email.extra = '', '{}'
+            email.save(update_fields=['status', 'sent_at', 'body', 'extra'])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
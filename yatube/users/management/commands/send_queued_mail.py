@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.mail import drain_queue
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди порциями с повторами при сбоях.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+                            help='Писем за одно соединение.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно, опрашивая очередь.')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Пауза между опросами пустой очереди, с.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain_queue(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, отложено или не отправлено: '
+                    f'{failed}')
+            if not options['loop']:
+                break
+            if not (sent or failed):
+                time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def clear_sent_bodies(apps, schema_editor):
+    OutgoingEmail = apps.get_model('users', 'OutgoingEmail')
+    OutgoingEmail.objects.filter(status='sent').update(body='', extra='{}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_sent_bodies, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,56 @@
-# from django.db import models
+from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Запрос только сохраняет письмо; отправляет его команда
+    send_queued_mail через EMAIL_QUEUE_BACKEND.
+    """
+
+    QUEUED = 'queued'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.TextField(verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    to = models.TextField(verbose_name='Получатели',
+                          help_text='Адреса в JSON-списке')
+    extra = models.TextField(
+        default='{}',
+        verbose_name='Прочие поля',
+        help_text='cc, bcc, reply_to, заголовки и альтернативы в JSON'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES,
+                              default=QUEUED, verbose_name='Статус')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попыток')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(blank=True,
+                                  verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Поставлено в очередь')
+    sent_at = models.DateTimeField(null=True, blank=True,
+                                   verbose_name='Отправлено')
+
+    def __str__(self):
+        return f'{self.subject} -> {self.to}'
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'],
+                         name='email_queue_due_idx'),
+        ]
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
@@ -0,0 +1,143 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from users.mail import drain_queue
+from users.models import OutgoingEmail
+
+User = get_user_model()
+
+
+class SlowBackend(EmailBackend):
+    def send_messages(self, messages):
+        time.sleep(1)
+        return super().send_messages(messages)
+
+
+class FlakyBackend(EmailBackend):
+    """Почтовый сервер, который не принимает письма на отказных адресах."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.startswith('bounce') for address in message.to):
+                raise ConnectionError('сервер недоступен')
+        return super().send_messages(messages)
+
+
+class BrokenBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('нет соединения')
+
+
+@override_settings(
+    EMAIL_BACKEND='users.mail.QueuedEmailBackend',
+    EMAIL_QUEUE_BACKEND='users.tests.test_mail.FlakyBackend',
+    EMAIL_QUEUE_MAX_ATTEMPTS=2,
+)
+class EmailQueueTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', email='auth@example.com', password='pass')
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.guest_client = Client()
+
+    def request_reset(self):
+        return self.guest_client.post(reverse('users:password_reset'),
+                                      {'email': 'auth@example.com'})
+
+    def send(self, to):
+        mail.send_mail('Тема', 'Текст', 'from@example.com', [to])
+
+    def make_due(self):
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+
+    @override_settings(EMAIL_QUEUE_BACKEND='users.tests.test_mail.SlowBackend')
+    def test_reset_only_enqueues(self):
+        """Сброс пароля ставит письмо в очередь, не дожидаясь сервера."""
+        started = time.perf_counter()
+        response = self.request_reset()
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertRedirects(response, reverse('users:password_reset_done'))
+        self.assertEqual(mail.outbox, [])
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.QUEUED)
+        self.assertIn('auth@example.com', email.to)
+
+    def test_worker_sends_queued_reset(self):
+        """Команда отправляет письмо со ссылкой сброса."""
+        self.request_reset()
+        out = StringIO()
+        call_command('send_queued_mail', stdout=out)
+        self.assertIn('Отправлено: 1', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['auth@example.com'])
+        self.assertIn('/auth/reset/', mail.outbox[0].body)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.SENT)
+        self.assertEqual((email.body, email.extra), ('', '{}'))
+
+    def test_admin_hides_body(self):
+        """Админка не показывает текст письма со ссылкой сброса."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass')
+        self.request_reset()
+        email = OutgoingEmail.objects.get()
+        link = next(line for line in email.body.splitlines()
+                    if '/auth/reset/' in line).strip()
+        client = Client()
+        client.force_login(admin)
+        for url in (
+            reverse('admin:users_outgoingemail_changelist'),
+            reverse('admin:users_outgoingemail_change', args=[email.pk]),
+        ):
+            with self.subTest(url=url):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, link)
+
+    def test_batch_size(self):
+        """За один проход уходит не больше порции писем."""
+        for i in range(5):
+            self.send(f'user{i}@example.com')
+        self.assertEqual(drain_queue(batch_size=3), (3, 0))
+        self.assertEqual(drain_queue(batch_size=3), (2, 0))
+        self.assertEqual(drain_queue(batch_size=3), (0, 0))
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failed_send_retried_then_given_up(self):
+        """Сбой откладывает письмо, после лимита попыток — отказ."""
+        self.send('bounce@example.com')
+        self.send('ok@example.com')
+        self.assertEqual(drain_queue(), (1, 1))
+        email = OutgoingEmail.objects.get(to__contains='bounce')
+        self.assertEqual(email.status, OutgoingEmail.QUEUED)
+        self.assertGreater(email.next_attempt_at,
+                           timezone.now() + timedelta(seconds=30))
+        self.assertEqual(drain_queue(), (0, 0))
+        self.make_due()
+        self.assertEqual(drain_queue(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertIn('сервер недоступен', email.last_error)
+
+    @override_settings(
+        EMAIL_QUEUE_BACKEND='users.tests.test_mail.BrokenBackend')
+    def test_connection_failure_keeps_batch(self):
+        """Недоступный сервер откладывает всю порцию."""
+        self.send('one@example.com')
+        self.send('two@example.com')
+        self.assertEqual(drain_queue(), (0, 2))
+        self.assertFalse(OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.QUEUED).exists())
@@ -9,6 +9,44 @@ SECRET_KEY = 'l3!vh&^gk&m-h9h(rwpvy$ygz*9r=#uw7)9$uu3galz!h_(=7r'
 
 POSTS_NUM: int = int(os.environ.get('POSTS_NUM', 10))
 
+# 'offset' — нумерованные страницы, 'keyset' — курсорная пагинация.
+PAGINATION_MODE: str = os.environ.get('PAGINATION_MODE', 'offset')
+
+# Время жизни числа постов главной страницы в кэше, секунды.
+POSTS_COUNT_TIMEOUT: int = 60 * 60
+
+# Если задан и максимальный id поста выше него, при промахе кэша
+# главная нумерует страницы по оценке вместо COUNT(*).
+PAGINATION_ESTIMATE_THRESHOLD = (
+    int(os.environ['PAGINATION_ESTIMATE_THRESHOLD'])
+    if 'PAGINATION_ESTIMATE_THRESHOLD' in os.environ else None
+)
+
+# Сколько строк отфильтрованного списка постов считает админка.
+ADMIN_COUNT_LIMIT: int = 10_000
+
+# Поиск групп по slug и авторов по username: размер LRU в памяти
+# процесса, сколько секунд его запись служит без сверки с общим кэшем
+# (столько другие процессы могут видеть старое название группы или
+# имя автора) и время жизни записей в общем кэше, секунды.
+LOOKUP_CACHE_SIZE: int = 1024
+LOOKUP_LOCAL_TIMEOUT: float = 5
+LOOKUP_CACHE_TIMEOUT: int = 60 * 60
+
+# Время жизни HTML карточки поста в кэше, секунды.
+POST_FRAGMENT_TIMEOUT: int = 60 * 60 * 24
+
+# Попадания и промахи карточек копятся в памяти процесса и сливаются
+# в общий кэш раз в столько отрисовок или секунд.
+FRAGMENT_STATS_FLUSH_EVERY: int = 100
+FRAGMENT_STATS_FLUSH_SECONDS: float = 10
+
+# Размер порции постов при потоковой выгрузке.
+EXPORT_CHUNK_SIZE: int = 1000
+
+# Время жизни страниц лент для анонимных пользователей, секунды.
+PAGE_CACHE_TIMEOUT: int = 60 * 10
+
 DEBUG = True
 
 ALLOWED_HOSTS = [
@@ -29,10 +67,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.server_timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -44,11 +86,24 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+# Кэширующий загрузчик держит скомпилированные шаблоны в памяти процесса;
+# правки шаблонов тогда видны только после перезапуска. По умолчанию
+# включён вне DEBUG. TEMPLATES_WARMUP компилирует все шаблоны при
+# старте WSGI-процесса, чтобы первые запросы не ждали разбора.
+TEMPLATES_CACHED: bool = os.environ.get(
+    'TEMPLATES_CACHED', '0' if DEBUG else '1') == '1'
+TEMPLATES_WARMUP: bool = os.environ.get(
+    'TEMPLATES_WARMUP', '1' if TEMPLATES_CACHED else '0') == '1'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template.backends.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -57,6 +112,10 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
             ],
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATES_CACHED else TEMPLATE_LOADERS
+            ),
         },
     },
 ]
@@ -72,6 +131,69 @@ DATABASES = {
 }
 
 
+def replica_databases(paths):
+    """Базы реплик SQLite по путям через запятую: replica1, replica2..."""
+    return {
+        f'replica{number}': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': path,
+            'TEST': {'MIRROR': 'default'},
+        }
+        for number, path in enumerate(filter(None, paths.split(',')),
+                                      start=1)
+    }
+
+
+# Реплики только для чтения: пути к файлам SQLite через запятую.
+# Безопасные запросы читают с них, запись и сессии — основная база.
+DATABASES.update(replica_databases(os.environ.get('DATABASE_REPLICAS', '')))
+REPLICA_DATABASES: list = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# PRAGMA каждого нового соединения с SQLite: WAL не даёт читателям
+# ждать писателя, synchronous=NORMAL в WAL безопасен при сбое процесса,
+# mmap и кэш страниц (в КиБ, поэтому со знаком минус) ускоряют чтение,
+# busy_timeout — сколько мс ждать чужую блокировку записи.
+SQLITE_PRAGMAS: dict = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Повторы пишущего запроса, если база всё же оказалась заблокирована,
+# и пауза перед первым повтором, секунды; дальше она удваивается.
+SQLITE_LOCK_RETRIES: int = 5
+SQLITE_LOCK_RETRY_DELAY: float = 0.05
+
+# Предел отставания реплик, секунды: столько после записи клиент
+# читает с основной базы, и не дольше живут в кэше карточки, страницы
+# и поиск групп и авторов, собранные по чтению с реплики.
+DATABASE_STICKY_SECONDS: int = int(
+    os.environ.get('DATABASE_STICKY_SECONDS', 10))
+
+# Кэш, общий для всех процессов сервера: на его поколениях держится
+# сброс карточек, страниц, 304 и поиска групп и авторов, поэтому
+# LocMemCache не годится (проверка posts.E001). SQLite держит процессы
+# на одной машине, и по умолчанию это файловый кэш; CACHE_BACKEND и
+# CACHE_LOCATION подключают memcached. MAX_ENTRIES больше стандартных
+# 300, чтобы карточки постов и страницы не вытесняли друг друга.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'core.cache.SparseCullFileBasedCache'),
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')),
+        'OPTIONS': {'MAX_ENTRIES': 50_000},
+    }
+}
+
+# Тесты получают свой кэш во временном каталоге (pytest — в conftest.py).
+TEST_RUNNER = 'core.testing.PrivateCacheRunner'
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,10 +223,72 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# collectstatic с хэшами в именах, манифестом и gzip-копиями; без
+# собранного манифеста {% static %} падает, поэтому вне DEBUG.
+STATIC_HASHED: bool = os.environ.get(
+    'STATIC_HASHED', '0' if DEBUG else '1') == '1'
+if STATIC_HASHED:
+    STATICFILES_STORAGE = (
+        'core.storage.CompressedManifestStaticFilesStorage')
+
+# Время кэширования статики без хэша в имени, секунды.
+STATIC_MAX_AGE: int = 60
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+THUMBNAIL_BACKEND = 'posts.thumbnails.PostThumbnailBackend'
+# Миниатюры картинок постов: размер -> (геометрия, опции sorl-thumbnail).
+# Режутся заранее после сохранения поста, шаблоны берут только готовые.
+POST_THUMBNAIL_SIZES = {
+    'list': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960', {'upscale': False}),
+}
+# Потоков нарезки миниатюр; 0 — резать сразу в потоке запроса.
+THUMBNAIL_WORKERS: int = int(os.environ.get('THUMBNAIL_WORKERS', 2))
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Строки с таймингами запросов пишутся в логгер yatube.timing.
+TIMING_LOG_LEVEL = os.environ.get(
+    'TIMING_LOG_LEVEL', 'WARNING' if DEBUG else 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'yatube.timing': {
+            'handlers': ['console'],
+            'level': TIMING_LOG_LEVEL,
+            'propagate': False,
+        },
+        'yatube.templates': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Запросы только ставят письма в очередь; отправляет их
+# manage.py send_queued_mail через EMAIL_QUEUE_BACKEND.
+EMAIL_BACKEND = 'users.mail.QueuedEmailBackend'
+EMAIL_QUEUE_BACKEND = os.environ.get(
+    'EMAIL_QUEUE_BACKEND', 'django.core.mail.backends.filebased.EmailBackend')
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Писем за одно соединение с сервером.
+EMAIL_QUEUE_BATCH_SIZE: int = 100
+# Попыток до статуса «не отправлено»; задержка повтора удваивается.
+EMAIL_QUEUE_MAX_ATTEMPTS: int = 5
+EMAIL_QUEUE_RETRY_DELAY: int = 60
+# На сколько секунд письмо закрепляется за обработчиком.
+EMAIL_QUEUE_LEASE: int = 60 * 5